@@ -1,8 +1,24 @@
 # -*- coding: utf-8 -*-
-from flask import Flask, request, jsonify
+from flask import Flask, Request, Response, request, jsonify, stream_with_context
+from io import BytesIO
+import json
 import os
+import config
+from utils.registry import AUTO, extract_file, is_supported
+from utils.workers import batch_tasks, extract_one, extract_many, iter_extract, iter_tasks, list_docx
+from utils.jobs import get_manager, QueueFullError
+
+
+class MemoryRequest(Request):
+    """上传的文件始终保存在内存中，不写入临时文件"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return BytesIO()
+
 
 app = Flask(__name__)
+app.request_class = MemoryRequest
+app.config['MAX_CONTENT_LENGTH'] = config.upload_max_size
 
 
 @app.route('/extract_from_docx', methods=['POST'])
@@ -10,35 +26,161 @@ def main():
     """
     参数格式：
     {
-        "template": "",  # 指定模板的名称
-        "file_path": ""  # 指定文件（文件夹）的路径
+        "template": "",  # 指定模板的名称，不传或为AUTO时根据文档内容自动识别
+        "file_path": "",  # 指定文件（文件夹）的路径
+        "workers": 4  # 可选，文件夹模式下同时并行解析的文件数，最多为config.workers（进程池的大小），为1时逐个解析
     }
     :return:
     """
     args = request.json
     if not args:
         return jsonify({'state': 0, 'msg': '非法的参数（application/json is needed!）'})
-    template = args['template']
+    template = args.get('template', AUTO)
     file_path = args['file_path']
-    if template not in ['HVCPSS', 'CHVPSS', 'LVBERF', 'LVNRERF', 'LVRERF', 'CMEDL', 'HVCERF', 'HVPSSR', 'HVSSS',
-                        'LVBEL', 'LVPSSR', 'LVSSS']:
+    if not is_supported(template):
         return jsonify({'state': 0, 'msg': f'不支持的模板名称：{template}'})
     if not os.path.exists(file_path):
         return jsonify({'state': 0, 'msg': f'非法的路径：{file_path}'})
-    extract(template, file_path)
-    return jsonify({'state': 1, 'msg': 'success'})
+    results = extract(template, file_path, args.get('workers'))
+    failed = sum(1 for r in results if not r['state'])
+    return jsonify({'state': 1, 'msg': 'success', 'total': len(results), 'failed': failed, 'results': results})
 
 
-def extract(template_name, file_path):
-    if os.path.isfile(file_path):
-        _extract(template_name, file_path)
+@app.route('/extract_from_docx/stream', methods=['POST'])
+def stream():
+    """
+    参数格式同/extract_from_docx，每处理完一个文件就返回一行JSON（application/x-ndjson），
+    包括模板名称、文件路径、提取出的实体、耗时及错误信息
+    """
+    args = request.json
+    if not args:
+        return jsonify({'state': 0, 'msg': '非法的参数（application/json is needed!）'})
+    template = args.get('template', AUTO)
+    file_path = args['file_path']
+    if not is_supported(template):
+        return jsonify({'state': 0, 'msg': f'不支持的模板名称：{template}'})
+    if not os.path.exists(file_path):
+        return jsonify({'state': 0, 'msg': f'非法的路径：{file_path}'})
+    files = list_docx(file_path)
+
+    def generate():
+        for result in iter_extract(template, files, args.get('workers'), ordered=False, with_entities=True):
+            yield json.dumps(result, ensure_ascii=False) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@app.route('/extract_from_docx/upload', methods=['POST'])
+def upload():
+    """
+    直接上传文档进行解析，不经过文件系统，支持两种方式：
+    1. multipart/form-data：表单字段template指定模板名称，一个或多个文件字段file
+    2. 请求体为文档本身：通过查询参数template指定模板名称，filename可选
+    """
+    template = request.values.get('template', AUTO)
+    if not is_supported(template):
+        return jsonify({'state': 0, 'msg': f'不支持的模板名称：{template}'})
+    if request.files:
+        docs = [(f.filename, f.stream) for f in request.files.getlist('file')]
     else:
-        files = os.listdir(file_path)
-        for file in files:
-            if file.endswith('.docx'):
-                abs_file_path = os.path.join(file_path, file)
-                _extract(template_name, abs_file_path)
+        data = request.get_data()
+        docs = [(request.args.get('filename', ''), data)] if data else []
+    if not docs:
+        return jsonify({'state': 0, 'msg': '未上传文档'})
+    results = [extract_one(template, filename, data=data) for filename, data in docs]
+    failed = sum(1 for r in results if not r['state'])
+    return jsonify({'state': 1, 'msg': 'success', 'total': len(results), 'failed': failed, 'results': results})
+
+
+@app.route('/extract_from_docx/batch', methods=['POST'])
+def batch():
+    """
+    一次提交多个（模板，路径）对，参数格式：
+    {
+        "items": [{"template": "", "file_path": ""}, ...],  # file_path可以是文件或文件夹
+        "workers": 4  # 可选，同时并行处理的组数，最多为config.workers（进程池的大小），为1时逐个处理
+    }
+    """
+    args = request.json
+    if not args or not isinstance(args.get('items'), list):
+        return jsonify({'state': 0, 'msg': '非法的参数（application/json is needed!）'})
+    results = []  # 待处理的文件先用None占位，保证结果顺序与参数一致
+    todo = []
+    for item in args['items']:
+        template = item.get('template', AUTO)
+        file_path = item.get('file_path')
+        if not is_supported(template):
+            results.append({'template': template, 'file': file_path, 'state': 0, 'msg': f'不支持的模板名称：{template}'})
+        elif not file_path or not os.path.exists(file_path):
+            results.append({'template': template, 'file': file_path, 'state': 0, 'msg': f'非法的路径：{file_path}'})
+        else:
+            files = list_docx(file_path)
+            todo.extend((template, f) for f in files)
+            results.extend([None] * len(files))
+    workers = args.get('workers') or config.workers
+    done = iter_tasks(batch_tasks(todo, workers), workers)
+    results = [r if r is not None else next(done) for r in results]
+    failed = sum(1 for r in results if not r['state'])
+    return jsonify({'state': 1, 'msg': 'success', 'total': len(results), 'failed': failed, 'results': results})
+
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    提交异步解析任务，参数格式同/extract_from_docx，立即返回任务编号
+    """
+    args = request.json
+    if not args:
+        return jsonify({'state': 0, 'msg': '非法的参数（application/json is needed!）'})
+    template = args.get('template', AUTO)
+    file_path = args['file_path']
+    if not is_supported(template):
+        return jsonify({'state': 0, 'msg': f'不支持的模板名称：{template}'})
+    if not os.path.exists(file_path):
+        return jsonify({'state': 0, 'msg': f'非法的路径：{file_path}'})
+    try:
+        job = get_manager().submit(template, file_path, args.get('workers'))
+    except QueueFullError as e:
+        return jsonify({'state': 0, 'msg': str(e)}), 503
+    return jsonify({'state': 1, 'msg': 'success', 'job_id': job.id_})
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_progress(job_id):
+    """查询任务进度"""
+    job = get_manager().get(job_id)
+    if job is None:
+        return jsonify({'state': 0, 'msg': f'任务不存在：{job_id}'}), 404
+    return jsonify({'state': 1, 'msg': 'success', 'job': job.progress()})
+
+
+@app.route('/jobs/<job_id>/results', methods=['GET'])
+def job_results(job_id):
+    """获取任务已完成部分的结果，offset指定从第几个结果开始返回"""
+    job = get_manager().get(job_id)
+    if job is None:
+        return jsonify({'state': 0, 'msg': f'任务不存在：{job_id}'}), 404
+    offset = request.args.get('offset', 0, type=int)
+    results = job.results_from(offset)
+    return jsonify({'state': 1, 'msg': 'success', 'job': job.progress(), 'offset': offset,
+                    'next_offset': offset + len(results), 'results': results})
+
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """取消任务，已提交给工作进程的文件仍会处理完"""
+    job = get_manager().get(job_id)
+    if job is None:
+        return jsonify({'state': 0, 'msg': f'任务不存在：{job_id}'}), 404
+    job.cancel()
+    return jsonify({'state': 1, 'msg': 'success', 'job': job.progress()})
+
+
+def extract(template_name, file_path, workers=None):
+    if os.path.isfile(file_path):
+        return [extract_one(template_name, file_path)]
+    return extract_many(template_name, list_docx(file_path), workers)
 
 
 def _extract(template_name, file_path):
-    pass
+    return extract_file(template_name, file_path)
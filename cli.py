@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""命令行批量解析
+
+即批量解析命令（extract-docx）：项目没有打包配置，不安装命令，直接以python cli.py运行。
+示例：python cli.py --template CHVPSS --workers 16 --shard 3/8 --report report.json 目录1 目录2
+回填大量历史文档时加上--bulk-load 暂存目录，改用LOAD DATA导入（见utils.bulkload）。
+设置了config.wal_dir时，结束前把写前日志重放到数据库（见utils.wal）。
+
+递归遍历给定目录下的所有docx文件，按相对路径的哈希值确定性地分片，
+多台机器各自指定不同的--shard即可分担同一批文件。
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import config
+from utils.bulkload import iter_bulk_load
+from utils.pipeline import iter_pipeline
+from utils.wal import drain
+from utils.registry import AUTO, is_supported
+from utils.workers import iter_extract, shutdown
+
+
+def walk(root):
+    """递归遍历目录，返回(相对路径, 绝对路径)"""
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        with os.scandir(d) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file() and entry.name.endswith('.docx') and not entry.name.startswith('~$'):
+                    yield os.path.relpath(entry.path, root), entry.path
+
+
+def in_shard(rel_path, index, count):
+    """按相对路径的md5分片，与机器、进程及目录的挂载位置无关"""
+    if count == 1:
+        return True
+    digest = hashlib.md5(rel_path.replace(os.sep, '/').encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count == index - 1
+
+
+def parse_shard(value):
+    try:
+        index, count = (int(i) for i in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'分片格式应为k/n：{value}')
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f'分片编号应在1到{count}之间：{value}')
+    return index, count
+
+
+def format_seconds(seconds):
+    seconds = int(seconds)
+    return f'{seconds // 3600:d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}'
+
+
+class Progress:
+    """在标准错误输出上显示进度、吞吐量及预计剩余时间"""
+
+    def __init__(self, total, interval=1.0):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.skipped = 0
+        self.rows = 0
+        self.start = time.monotonic()
+        self.interval = interval
+        self.last = 0
+
+    def update(self, result):
+        self.done += 1
+        if not result['state']:
+            self.failed += 1
+        elif result.get('skipped'):
+            self.skipped += 1
+        self.rows += result['rows']
+        now = time.monotonic()
+        if now - self.last >= self.interval or self.done == self.total:
+            self.last = now
+            self.show(now)
+
+    def show(self, now):
+        elapsed = now - self.start
+        rate = self.done / elapsed if elapsed else 0
+        eta = (self.total - self.done) / rate if rate else 0
+        sys.stderr.write(f'\r{self.done}/{self.total} 失败{self.failed} 跳过{self.skipped} '
+                         f'{rate:.1f}个/秒 已用{format_seconds(elapsed)} 剩余{format_seconds(eta)}')
+        sys.stderr.flush()
+
+    def summary(self):
+        elapsed = time.monotonic() - self.start
+        return {
+            'total': self.total,
+            'done': self.done,
+            'failed': self.failed,
+            'skipped': self.skipped,
+            'rows': self.rows,
+            'elapsed': round(elapsed, 2),
+            'files_per_second': round(self.done / elapsed, 2) if elapsed else 0,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python cli.py', description='批量解析docx文件并入库')
+    parser.add_argument('dirs', nargs='+', help='要解析的目录（递归遍历）或文件')
+    parser.add_argument('--template', default=AUTO, help='模板名称，默认根据文档内容自动识别')
+    parser.add_argument('--workers', type=int, default=config.workers, help='并行解析的进程数')
+    parser.add_argument('--shard', type=parse_shard, default=(1, 1), metavar='K/N',
+                        help='只处理N个分片中的第K个（从1开始）')
+    parser.add_argument('--report', help='将汇总报告（含失败文件列表）以JSON格式写入该文件')
+    parser.add_argument('--bulk-load', metavar='SPOOL_DIR',
+                        help='用于回填：各表的行先写入该目录下的TSV文件，再用LOAD DATA LOCAL INFILE导入')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='解析与写入分离：进程池只解析，由写入线程批量写入（见utils.pipeline）')
+    parser.add_argument('--writers', type=int, default=config.pipeline_writers, help='--pipeline模式下的写入线程数')
+    args = parser.parse_args(argv)
+    if not is_supported(args.template):
+        parser.error(f'不支持的模板名称：{args.template}')
+    if config.upsert and (args.bulk_load or args.pipeline):
+        parser.error('--bulk-load及--pipeline模式不支持按业务键写入（config.upsert），请关闭upsert或使用普通模式')
+    config.workers = args.workers
+
+    files = []
+    for d in args.dirs:
+        if os.path.isfile(d):
+            candidates = [(os.path.basename(d), d)]
+        elif os.path.isdir(d):
+            candidates = walk(d)
+        else:
+            parser.error(f'非法的路径：{d}')
+        files.extend(path for rel, path in candidates if in_shard(rel, *args.shard))
+    files.sort()
+    print(f'分片{args.shard[0]}/{args.shard[1]}：共{len(files)}个文件', file=sys.stderr)
+
+    progress = Progress(len(files))
+    failures = []
+    try:
+        if args.bulk_load:
+            results = iter_bulk_load(args.template, files, args.bulk_load, args.workers)
+        elif args.pipeline:
+            results = iter_pipeline(args.template, files, args.workers, args.writers)
+        else:
+            results = iter_extract(args.template, files, args.workers, ordered=False,
+                                   group_commit=config.group_commit)
+        for result in results:
+            progress.update(result)
+            if not result['state']:
+                failures.append({'file': result['file'], 'template': result['template'], 'msg': result['msg']})
+    finally:
+        sys.stderr.write('\n')
+        shutdown()
+    if config.wal_dir:
+        # 工作进程退出后，在当前进程中重放它们尚未重放完的日志
+        pending = drain()
+        if pending:
+            print(f'写前日志尚有{pending}个段未写入数据库，稍后运行python -m utils.wal重放', file=sys.stderr)
+
+    report = progress.summary()
+    report.update(template=args.template, shard=f'{args.shard[0]}/{args.shard[1]}', dirs=args.dirs,
+                  workers=args.workers, failures=failures)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    print(json.dumps({k: v for k, v in report.items() if k != 'failures'}, ensure_ascii=False))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
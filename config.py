@@ -7,4 +7,75 @@ db_config = {
     'password': 'Ly123456*',
     'db': 'bj_YKKG'
 }
+# 数据库连接池（每个进程一个）：最大连接数、连接最长使用时间（秒）、
+# 空闲多久后取出前先检查连接（秒）、等待空闲连接的超时时间（秒）
+db_pool_size = 8
+db_pool_recycle = 3600
+db_pool_ping_interval = 30
+db_pool_timeout = 30
+# 批量写入时每条insert语句最多包含的行数
+insert_batch_size = 500
+# 大批量导入（cli.py --bulk-load）时每张表的暂存文件超过该大小（字节）即导入一次
+bulk_load_threshold = 256 * 1024 * 1024
+# 解析与写入分离的流水线（cli.py --pipeline）：写入线程数、解析结果队列的最大长度（文档数）
+pipeline_writers = 2
+pipeline_queue_size = 64
+# 标准目录在内存中缓存的时间（秒），超过后检查标准表是否变化，有变化时重新加载
+standards_refresh = 300
+# 目录模式下并行解析所用的进程数（进程池的大小），为1时在当前进程中逐个解析；
+# 请求中的workers只能限制该请求同时占用的进程数，不能超过该值
+workers = 4
+# 工作进程启动时预先加载的模板，为None时加载全部模板
+preload_templates = None
+# 批量接口每组的文件数，同一组在一个工作进程中用一个连接、一个事务写入
+batch_chunk_size = 50
+# 命令行（cli.py）是否合并提交：为True时按batch_chunk_size分组交给工作进程，
+# 每处理group_commit_docs个文件或经过group_commit_ms毫秒提交一次事务，每个文件用保存点保证完整写入或完全不写入；
+# 批量接口始终按组提交，流式接口、异步任务及watcher.py始终逐个文件提交
+group_commit = True
+group_commit_docs = 50
+group_commit_ms = 1000
+# 是否记录已解析的文件：内容未变的文件跳过，内容变化的文件先删除上次写入的行
+manifest = True
+# 是否按业务键写入：业务键相同的文档再次解析时复用已有实体的id，只更新变化的字段并整体替换关系，
+# 而不是再插入一份；business_keys为 模板名称 -> 业务键（文档中唯一实体的属性），未配置的模板照常插入。
+# cli.py的--bulk-load及--pipeline模式不支持，开启时报错
+upsert = False
+business_keys = {
+    'CMEDL': ['application_number'],
+    'HVCERF': ['application_number'],
+    'HVSSS': ['application_number'],
+    'LVBEL': ['application_number'],
+    'LVBERF': ['application_number'],
+    'LVNRERF': ['application_number'],
+    'LVRERF': ['application_number'],
+    'LVSSS': ['application_number'],
+    'HVPSSR': ['apply_id'],
+    'LVPSSR': ['apply_id'],
+}
+# 写前日志目录，设置后解析结果先追加到该目录下的日志段中，再由后台线程重放到数据库（见utils/wal.py），
+# 数据库不可用时解析照常进行；为None时直接写入数据库。重放时按行插入，不支持upsert，
+# 也不影响--bulk-load及--pipeline模式
+wal_dir = None
+# 每个日志段的最大大小（字节）、每条记录写入后是否fsync
+wal_segment_size = 64 * 1024 * 1024
+wal_fsync = True
+# 重放时每个事务最多写入的文档数、没有新记录时的检查间隔（秒）、数据库出错后的重试间隔（秒）
+wal_batch_docs = 50
+wal_poll_interval = 1
+wal_retry_interval = 5
+# 异步任务：同时执行的任务数、最多排队的任务数、保留的已结束任务数
+job_runners = 2
+job_queue_size = 16
+job_history = 100
+# 上传接口允许的最大请求体（字节），上传的文档只保存在内存中
+upload_max_size = 64 * 1024 * 1024
+# 监视的文件夹及其模板名称（AUTO为自动识别），见watcher.py
+watch_dirs = {}
+# 扫描文件夹的间隔（秒），以及文件多久不再变化才认为写入完成（秒）
+watch_interval = 2
+watch_settle = 3
+# 解析失败（如数据库暂时不可用）的文件多久后重试（秒），之后每次失败间隔加倍，最长为watch_retry_max秒
+watch_retry = 10
+watch_retry_max = 600
 # <<<<<配置区域
@@ -1,43 +1,17 @@
 # -*- coding: utf-8 -*-
-import pymysql
-from config import db_config
-
-conn = pymysql.connect(**db_config)
-cr = conn.cursor()
+from utils.docx_reader import read_docx
+from utils.schema import ensure_tables, relation_table, template_tables
+from utils.standards import get_index
 
 
 def initialize(scheme_id: str, classes: dict, data_properties: dict, object_properties: dict):
-    """根据本体模型初始化相关表"""
-    for _class in classes:
-        table_name = scheme_id + '_' + _class
-        fields = ['id']
-        comments = ['唯一标识']
-        for pro in data_properties:
-            if data_properties[pro]['domain'] == _class:
-                fields.append(pro)
-                comments.append(data_properties[pro]['desc'])
-        sql = f"create table if not exists `{table_name}`("
-        for i in range(len(fields)):
-            sql += f"`{fields[i]}` varchar(255) comment '{comments[i]}',"
-        sql = sql[:-1]
-        sql += ')'
-        cr.execute(sql)
-    conn.commit()
-    for i in object_properties:
-        rel = object_properties[i]
-        rel_tab = scheme_id + '_' + rel['domain'] + '_2_' + rel['range']
-        sql = f"""create table if not exists `{rel_tab}`(
-                `id` varchar(255) primary key,
-                `from_id` varchar(255),
-                `to_id` varchar(255),
-                `rel_name` varchar (10) default '{rel["name"]}'
-                )
-            """
-        cr.execute(sql)
-    conn.commit()
+    """根据本体模型初始化相关表，已有的表只补充缺少的字段（见utils.schema）"""
+    ensure_tables(template_tables(scheme_id, classes, data_properties, object_properties))
 
 
 def std_rel(scheme_id: str, class_std: dict):
+    """在标准目录（见utils.standards）中查找各类引用的标准，并建立实体——标准的关系表"""
+    standards = get_index()
     object_properties1 = {}
     class_std_id = {}
     obj_per_list = []
@@ -45,54 +19,28 @@ def std_rel(scheme_id: str, class_std: dict):
     for i in class_std:
         if i not in class_std_id.keys():
             class_std_id[i] = {}
-        cr.execute("update bz_tab set BZ_name = replace(BZ_name,' ','')")
-        cr.execute("update bz_1_info set BZ_first_title = replace(BZ_first_title,' ','')")
-        cr.execute("update bz_2_info set BZ_second_title = replace(BZ_second_title,' ','')")
         for j in class_std[i]:
             j = j.replace(' ', '')
-            object_properties1[num] = {'domain': i, 'name': 'reference', 'ZH_name': '参考', 'desc': '描述参考的哪个标准'}
-            cr.execute(f"select id from bz_tab where BZ_name = '{j}'")
-            res = cr.fetchone()
-            if res is not None:
-                object_properties1[num]['range'] = 'bz_tab'
-                if 'bz_tab' not in class_std_id[i]:
-                    class_std_id[i]['bz_tab'] = []
-                class_std_id[i]['bz_tab'].append(res[0])
-            else:
-                cr.execute(f"select id from bz_1_info where BZ_first_title = '{j}'")
-                res = cr.fetchone()
-                if res is not None:
-                    object_properties1[num]['range'] = 'bz_1_info'
-                    if 'bz_1_info' not in class_std_id[i]:
-                        class_std_id[i]['bz_1_info'] = []
-                    class_std_id[i]['bz_1_info'].append(res[0])
-                else:
-                    cr.execute(f"select id from bz_2_info where BZ_second_title = '{j}'")
-                    res = cr.fetchone()
-                    if res is not None:
-                        object_properties1[num]['range'] = 'bz_2_info'
-                        if 'bz_2_info' not in class_std_id[i]:
-                            class_std_id[i]['bz_2_info'] = []
-                        class_std_id[i]['bz_2_info'].append(res[0])
-                    else:
-                        print(f'未找到对应标准{j}，请检查对应标准是否与数据库存储值一致')
-                        continue
+            res = standards.lookup(j)
+            if res is None:
+                print(f'未找到对应标准{j}，请检查对应标准是否与数据库存储值一致')
+                continue
+            range_, id_ = res
+            object_properties1[num] = {'domain': i, 'range': range_, 'name': 'reference', 'ZH_name': '参考',
+                                       'desc': '描述参考的哪个标准'}
+            if range_ not in class_std_id[i]:
+                class_std_id[i][range_] = []
+            class_std_id[i][range_].append(id_)
             num += 1
     for i in list(object_properties1.keys()):
         if object_properties1[i] not in obj_per_list:
             obj_per_list.append(object_properties1[i])
         else:
             del object_properties1[i]
+    tables = {}
     for i in object_properties1:
         rel = object_properties1[i]
         rel_tab = scheme_id + '_' + rel['domain'] + '_2_' + rel['range']
-        sql = f"""create table if not exists `{rel_tab}`(
-                `id` varchar(255) primary key,
-                `from_id` varchar(255),
-                `to_id` varchar(255),
-                `rel_name` varchar (10) default '{rel["name"]}'
-                )
-            """
-        cr.execute(sql)
-    conn.commit()
+        tables[rel_tab] = relation_table(rel['name'])
+    ensure_tables(tables)
     return object_properties1, class_std_id
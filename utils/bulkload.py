@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""大批量导入（LOAD DATA LOCAL INFILE）
+
+用于一次性回填大量历史文档：工作进程只解析文档（见workers.extract_rows），
+将要写入的行按表返回给主进程；主进程把这些行追加到每张表一个的TSV暂存文件中，
+某个文件超过config.bulk_load_threshold字节或全部解析完成时，在一个事务中用LOAD DATA LOCAL INFILE导入全部暂存文件。
+
+开启config.manifest时跳过内容已解析过的文件，每次导入时在同一事务中记录暂存文件中各文件的清单，
+中途出错或中断时未导入的暂存文件直接丢弃，重新运行时只会解析这些文件，不会重复插入；
+与逐行写入不同，内容变化的文件不会删除上次写入的行，重新解析这类文件请使用普通模式。
+LOAD DATA只能插入，不支持按业务键写入（config.upsert）。
+"""
+import os
+import pymysql
+import config
+from utils import manifest
+from utils.workers import extract_rows, iter_tasks
+
+
+def _escape(value):
+    # LOAD DATA默认的转义规则：\N为NULL，反斜杠、制表符及换行需要转义
+    if value is None:
+        return '\\N'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r').replace('\0', '\\0'))
+
+
+class Spooler:
+    """实例将各表的行追加到暂存文件中，超过阈值时导入"""
+
+    def __init__(self, spool_dir, threshold=None):
+        self.spool_dir = spool_dir
+        self.threshold = threshold or config.bulk_load_threshold
+        self.files = {}  # 表名 -> (文件, 字段)
+        self.entries = []  # 行在暂存文件中的文件的清单记录，见manifest.remember_many
+        self.loaded = 0  # 已导入的行数
+        # LOAD DATA LOCAL需要开启local_infile，因此不使用连接池中的连接
+        self.conn = pymysql.connect(**config.db_config, local_infile=True)
+        if config.manifest:
+            # 建表语句会隐式提交事务，所以在导入前确保清单表存在
+            manifest.ensure_table(self.conn.cursor())
+        os.makedirs(spool_dir, exist_ok=True)
+
+    def path(self, table):
+        return os.path.join(self.spool_dir, table + '.tsv')
+
+    def add(self, tables, entry=None):
+        """追加一个文档的行（表名 -> (字段, 行)），entry为该文档的清单记录；有暂存文件超过阈值时全部导入
+
+        整个文档的行都追加后才检查阈值，每次导入的都是完整的文档
+        """
+        for table, (columns, rows) in tables.items():
+            if table not in self.files:
+                self.files[table] = (open(self.path(table), 'w', encoding='utf-8', newline='\n'), columns)
+            f = self.files[table][0]
+            for row in rows:
+                f.write('\t'.join(_escape(v) for v in row) + '\n')
+        if entry is not None:
+            self.entries.append(entry)
+        if any(f.tell() >= self.threshold for f, _ in self.files.values()):
+            self.flush()
+
+    def flush(self):
+        """在一个事务中导入全部暂存文件并记录其中各文件的清单，之后删除暂存文件"""
+        cr = self.conn.cursor()
+        loaded = 0
+        try:
+            for table, (f, columns) in self.files.items():
+                f.close()
+                fields = ', '.join(f'`{c}`' for c in columns)
+                cr.execute(f"load data local infile %s into table `{table}` character set utf8mb4 "
+                           f"fields terminated by '\\t' escaped by '\\\\' lines terminated by '\\n' ({fields})",
+                           (self.path(table),))
+                loaded += cr.rowcount
+            if self.entries:
+                manifest.remember_many(cr, self.entries)
+            self.conn.commit()
+        except BaseException:
+            try:
+                self.conn.rollback()
+            except pymysql.Error:
+                pass
+            raise
+        self.loaded += loaded
+        self.discard()
+
+    def discard(self):
+        """删除全部暂存文件，不导入"""
+        for table, (f, _) in self.files.items():
+            f.close()
+            os.remove(self.path(table))
+        self.files = {}
+        self.entries = []
+
+    def close(self):
+        self.conn.close()
+
+
+def iter_bulk_load(name, file_paths, spool_dir, workers=None, cancel_event=None):
+    """解析多个文件并用LOAD DATA导入，按完成的先后逐个返回每个文件的处理结果
+
+    返回的结果与iter_extract一致，文件的行在之后的某次导入时才写入；
+    中途出错或中断时丢弃尚未导入的暂存文件，其中的文件没有记入清单，重新运行时会再次解析。
+    """
+    if config.upsert:
+        raise RuntimeError('LOAD DATA只能插入，不支持按业务键写入（config.upsert），请关闭upsert或使用普通模式')
+    workers = workers or config.workers
+    spooler = Spooler(spool_dir)
+    try:
+        tasks = ((extract_rows, name, file_path) for file_path in file_paths)
+        for result in iter_tasks(tasks, workers, cancel_event, ordered=False):
+            entry = None
+            if result['state'] and not result.get('skipped') and config.manifest:
+                entry = (result['file'], result['content_hash'], result['template'], result.pop('row_ids'))
+            result.pop('content_hash', None)
+            spooler.add(result.pop('tables', {}), entry)
+            yield result
+        spooler.flush()
+    except BaseException:
+        spooler.discard()
+        raise
+    finally:
+        spooler.close()
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""数据库连接池
+
+每个进程一个连接池（spawn启动的工作进程各自创建），连接按线程取出：
+同一线程嵌套取连接时得到的是同一个连接，最外层用完后才放回池中。
+空闲超过config.db_pool_ping_interval秒的连接取出前先ping一次，
+建立超过config.db_pool_recycle秒的连接放回时直接关闭，由之后的请求重新建立。
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+import pymysql
+import config
+
+
+class PoolTimeoutError(Exception):
+    """等待空闲连接超时"""
+
+
+class ConnectionPool:
+    """实例维护最多size个到同一数据库的连接"""
+
+    def __init__(self, db_config, size=None, recycle=None, ping_interval=None, timeout=None):
+        self.db_config = db_config
+        self.size = size or config.db_pool_size
+        self.recycle = recycle or config.db_pool_recycle
+        self.ping_interval = config.db_pool_ping_interval if ping_interval is None else ping_interval
+        self.timeout = timeout or config.db_pool_timeout
+        self.idle = []  # 空闲连接：(连接, 放回时间)
+        self.created = {}  # 连接 -> 建立时间
+        self.count = 0  # 已建立及正在建立的连接数
+        self.cond = threading.Condition()
+        self.local = threading.local()
+
+    def acquire(self):
+        """取出当前线程的连接，当前线程已经持有连接时直接返回该连接"""
+        held = getattr(self.local, 'conn', None)
+        if held is not None:
+            self.local.depth += 1
+            return held
+        conn = self._checkout()
+        self.local.conn = conn
+        self.local.depth = 1
+        return conn
+
+    def release(self, conn):
+        """当前线程最外层用完连接后放回池中"""
+        self.local.depth -= 1
+        if self.local.depth:
+            return
+        self.local.conn = None
+        self._checkin(conn)
+
+    def _checkout(self):
+        deadline = time.monotonic() + self.timeout
+        with self.cond:
+            while not self.idle and self.count >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(f'{self.timeout}秒内没有空闲的数据库连接')
+                self.cond.wait(remaining)
+            if not self.idle:
+                # 先计数，连接在锁外建立
+                self.count += 1
+                item = None
+            else:
+                item = self.idle.pop()
+        if item is None:
+            return self._connect()
+        conn, returned = item
+        if time.monotonic() - returned > self.ping_interval:
+            try:
+                conn.ping(reconnect=False)
+            except pymysql.Error:
+                self._discard(conn)
+                with self.cond:
+                    self.count += 1
+                return self._connect()
+        return conn
+
+    def _connect(self):
+        try:
+            conn = pymysql.connect(**self.db_config)
+        except Exception:
+            with self.cond:
+                self.count -= 1
+                self.cond.notify()
+            raise
+        self.created[conn] = time.monotonic()
+        return conn
+
+    def _checkin(self, conn):
+        created = self.created.get(conn)
+        if created is None or time.monotonic() - created > self.recycle or not conn.open:
+            self._discard(conn)
+            return
+        with self.cond:
+            self.idle.append((conn, time.monotonic()))
+            self.cond.notify()
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self.cond:
+            if self.created.pop(conn, None) is not None:
+                self.count -= 1
+            self.cond.notify()
+
+    def close(self):
+        """关闭所有空闲连接"""
+        with self.cond:
+            idle, self.idle = self.idle, []
+        for conn, _ in idle:
+            self._discard(conn)
+
+
+_pool = None
+_pool_pid = None
+_lock = threading.Lock()
+
+
+def get_pool():
+    """当前进程的连接池，首次调用时创建"""
+    global _pool, _pool_pid
+    with _lock:
+        # fork出的子进程不能沿用父进程的连接
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ConnectionPool(config.db_config)
+            _pool_pid = os.getpid()
+    return _pool
+
+
+@contextmanager
+def connection():
+    """从连接池取出当前线程的连接
+
+    最外层正常结束时提交事务，抛出异常时回滚，之后放回池中；
+    嵌套使用时只有最外层负责提交或回滚。
+    """
+    pool = get_pool()
+    conn = pool.acquire()
+    outermost = pool.local.depth == 1
+    try:
+        yield conn
+        if outermost:
+            conn.commit()
+    except BaseException:
+        if outermost:
+            try:
+                conn.rollback()
+            except pymysql.Error:
+                pass
+        raise
+    finally:
+        pool.release(conn)
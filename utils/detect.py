@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""根据文档内容自动识别模板
+
+依次尝试：
+1. 标题：正文开头几个段落中是否有某个模板的标题；
+2. 段落：没有表格的供电方案类文档，根据「根据...确定供电方案如下」等段落区分；
+3. 表格：统计第一个表格中出现了哪些模板特有的标签单元格，取命中最多的模板。
+
+各模板的标题及标签单元格写在其声明式模板（见utils.spec_engine）的JSON中。
+"""
+import re
+from utils import spec_engine
+
+# 标题 -> 模板名称（标题中的空白已去除，「勘查」统一为「勘察」）
+TITLES = {}
+
+# 模板名称 -> 第一个表格中该模板特有的标签单元格（空白已去除）
+TABLE_LABELS = {}
+
+SCHEME_RULE = re.compile(r'根据.*确定供电方案如下')
+COMMUNITY_RULE = re.compile(r'根据客户提供的小区建设规划|该小区采用')
+
+_blank = re.compile(r'\s+')
+
+# 只看正文开头的若干段落
+TITLE_PARAGRAPHS = 8
+
+
+def _normalize(text):
+    return _blank.sub('', text).replace('勘查', '勘察')
+
+
+def _add_specs():
+    for name, path in spec_engine.discover().items():
+        spec = spec_engine.read_spec(path)
+        if 'title' in spec:
+            TITLES.setdefault(_normalize(spec['title']), name)
+        if 'table_labels' in spec:
+            TABLE_LABELS.setdefault(name, spec['table_labels'])
+
+
+_add_specs()
+
+
+def detect_template(docx):
+    """识别已读取的文档（见utils.read_docx）属于哪个模板，无法识别时返回None"""
+    paragraphs = docx.paragraphs
+    n = 0
+    for p in paragraphs:
+        text = _normalize(p.text)
+        if not text:
+            continue
+        if text in TITLES:
+            return TITLES[text]
+        n += 1
+        if n >= TITLE_PARAGRAPHS:
+            break
+
+    tables = docx.tables
+    if not tables:
+        if not any(SCHEME_RULE.match(p.text) for p in paragraphs):
+            return
+        if any(COMMUNITY_RULE.match(p.text) for p in paragraphs):
+            return 'CHVPSS'
+        return 'HVCPSS'
+
+    labels = {_normalize(cell.text) for row in tables[0].rows for cell in row.cells}
+    best, best_score = None, 0
+    for name, fingerprint in TABLE_LABELS.items():
+        score = sum(1 for label in fingerprint if label in labels)
+        if score > best_score:
+            best, best_score = name, score
+    return best
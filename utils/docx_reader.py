@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""轻量的docx读取
+
+python-docx的Document会为整个文档包（样式、编号、页眉及每个段落）建立对象模型，而解析只用到正文的段落及表格。
+这里只打开zip中的正文部分（通常为word/document.xml），用lxml的iterparse逐个读取正文中的段落和表格，
+读完一个就清除对应的元素，内存占用与文档大小基本无关。
+
+得到的文本与python-docx一致：
+- 段落的文本由直接包含的w:r及w:hyperlink中的w:r组成，runs只包含直接的w:r；
+- run的文本中w:tab、w:ptab为\\t，w:br（换行）、w:cr为\\n，分页及分栏符为空，w:noBreakHyphen为-；
+- run的underline：没有设置为None，single为True，none为False，其他线型为线型名称；
+- 单元格的文本为其中各段落的文本以\\n连接，表格只保留每个单元格的文本、横向合并的列数及纵向合并标记，
+  合并单元格的解析见utils.table_grid。
+"""
+import posixpath
+from io import BytesIO
+from zipfile import BadZipFile, ZipFile
+from lxml import etree
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_BODY = W + 'body'
+W_P = W + 'p'
+W_R = W + 'r'
+W_T = W + 't'
+W_TBL = W + 'tbl'
+W_TR = W + 'tr'
+W_TC = W + 'tc'
+W_VAL = W + 'val'
+
+# run中各元素对应的文本，w:br另行处理
+_RUN_TEXT = {W + 'tab': '\t', W + 'ptab': '\t', W + 'cr': '\n', W + 'noBreakHyphen': '-'}
+
+_RELS = '_rels/.rels'
+_OFFICE_DOCUMENT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+
+
+class Run:
+    __slots__ = ('text', 'underline')
+
+    def __init__(self, text, underline):
+        self.text = text
+        self.underline = underline
+
+
+class Paragraph:
+    __slots__ = ('text', 'runs')
+
+    def __init__(self, text, runs):
+        self.text = text
+        self.runs = runs
+
+
+class Cell:
+    """单元格：文本、横向合并的列数、纵向合并标记（None、'restart'或'continue'）"""
+    __slots__ = ('text', 'grid_span', 'v_merge')
+
+    def __init__(self, text, grid_span=1, v_merge=None):
+        self.text = text
+        self.grid_span = grid_span
+        self.v_merge = v_merge
+
+
+class Row:
+    """表格中的一行：行首空出的列数，及该行实际包含的单元格（每个w:tc一个）"""
+    __slots__ = ('grid_before', 'cells')
+
+    def __init__(self, grid_before, cells):
+        self.grid_before = grid_before
+        self.cells = cells
+
+
+class Table:
+    __slots__ = ('rows',)
+
+    def __init__(self, rows):
+        self.rows = rows
+
+
+class DocxContent:
+    """实例保存一个文档正文中的段落和表格（均只包括正文中直接出现的，不含表格中的段落及嵌套的表格）"""
+
+    def __init__(self, paragraphs, tables):
+        self.paragraphs = paragraphs
+        self.tables = tables
+
+
+def _run(r):
+    texts = []
+    for child in r:
+        tag = child.tag
+        if tag == W_T:
+            texts.append(child.text or '')
+        elif tag == W + 'br':
+            # type省略时为textWrapping
+            if child.get(W + 'type', 'textWrapping') == 'textWrapping':
+                texts.append('\n')
+        elif tag in _RUN_TEXT:
+            texts.append(_RUN_TEXT[tag])
+    underline = None
+    rpr = r.find(W + 'rPr')
+    u = rpr.find(W + 'u') if rpr is not None else None
+    if u is not None:
+        val = u.get(W_VAL)
+        underline = True if val == 'single' else False if val == 'none' else val
+    return Run(''.join(texts), underline)
+
+
+def _paragraph(p):
+    texts = []
+    runs = []
+    for child in p:
+        if child.tag == W_R:
+            run = _run(child)
+            runs.append(run)
+            texts.append(run.text)
+        elif child.tag == W + 'hyperlink':
+            texts.extend(_run(r).text for r in child.iterchildren(W_R))
+    return Paragraph(''.join(texts), runs)
+
+
+def _cell(tc):
+    grid_span = 1
+    v_merge = None
+    tc_pr = tc.find(W + 'tcPr')
+    if tc_pr is not None:
+        span = tc_pr.find(W + 'gridSpan')
+        if span is not None:
+            grid_span = int(span.get(W_VAL))
+        merge = tc_pr.find(W + 'vMerge')
+        if merge is not None:
+            v_merge = merge.get(W_VAL, 'continue')
+    text = '\n'.join(_paragraph(p).text for p in tc.iterchildren(W_P))
+    return Cell(text, grid_span, v_merge)
+
+
+def _table(tbl):
+    rows = []
+    for tr in tbl.iterchildren(W_TR):
+        grid_before = 0
+        tr_pr = tr.find(W + 'trPr')
+        before = tr_pr.find(W + 'gridBefore') if tr_pr is not None else None
+        if before is not None:
+            grid_before = int(before.get(W_VAL))
+        rows.append(Row(grid_before, [_cell(tc) for tc in tr.iterchildren(W_TC)]))
+    return Table(rows)
+
+
+def _main_part(zf):
+    """正文部分在zip中的路径，由包的关系文件指定"""
+    rels = etree.fromstring(zf.read(_RELS))
+    for rel in rels:
+        if rel.get('Type') == _OFFICE_DOCUMENT:
+            return posixpath.normpath(rel.get('Target').lstrip('/'))
+    raise KeyError('officeDocument')
+
+
+def parse(stream):
+    """逐个读取正文（document.xml）中的段落和表格，返回(段落, 表格)"""
+    paragraphs = []
+    tables = []
+    for _, elem in etree.iterparse(stream, events=('end',), tag=(W_P, W_TBL),
+                                   remove_blank_text=True, resolve_entities=False):
+        parent = elem.getparent()
+        if parent is None or parent.tag != W_BODY:
+            # 表格中的段落及嵌套的表格，等所在的表格读完后一起处理
+            continue
+        if elem.tag == W_P:
+            paragraphs.append(_paragraph(elem))
+        else:
+            tables.append(_table(elem))
+        elem.clear()
+        while elem.getprevious() is not None:
+            del parent[0]
+    return paragraphs, tables
+
+
+def read_docx(source):
+    """读取一个docx文档的正文，source可以是文件路径、bytes或类文件对象，无法打开时返回None
+
+    source已经是读取过的文档时直接返回
+    """
+    if isinstance(source, DocxContent):
+        return source
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+    try:
+        with ZipFile(source) as zf:
+            with zf.open(_main_part(zf)) as f:
+                paragraphs, tables = parse(f)
+    except (BadZipFile, KeyError, FileNotFoundError):
+        name = source if isinstance(source, str) else '<内存文档>'
+        print(f'路径不正确或目标为加密文档：{name}')
+        return
+    return DocxContent(paragraphs, tables)
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""异步解析任务
+
+提交任务后立即返回任务编号，任务在后台排队执行。排队的任务数受config.job_queue_size限制，
+同时执行的任务数受config.job_runners限制，避免多个大文件夹同时提交时压垮服务器。
+"""
+import queue
+import threading
+import time
+from collections import OrderedDict
+from uuid import uuid1
+import config
+from utils.workers import iter_extract, list_docx
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class Job:
+    """实例表示一个解析任务"""
+
+    def __init__(self, template, file_path, workers=None):
+        self.id_ = uuid1().hex
+        self.template = template
+        self.file_path = file_path
+        self.workers = workers or config.workers
+        self.files = list_docx(file_path)
+        self.state = 'pending'  # pending/running/done/cancelled/failed
+        self.error = None  # 任务失败时的出错信息
+        self.done = 0
+        self.failed = 0
+        self.rows = 0
+        self.results = []
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.cancel_event = threading.Event()
+        self.lock = threading.Lock()
+
+    def add_result(self, result):
+        with self.lock:
+            self.results.append(result)
+            self.done += 1
+            if not result['state']:
+                self.failed += 1
+            self.rows += result.get('rows', 0)
+
+    def cancel(self):
+        self.cancel_event.set()
+        with self.lock:
+            if self.state == 'pending':
+                self.state = 'cancelled'
+                self.finished = time.time()
+
+    def progress(self):
+        with self.lock:
+            return {
+                'job_id': self.id_,
+                'template': self.template,
+                'file_path': self.file_path,
+                'state': self.state,
+                'error': self.error,
+                'total': len(self.files),
+                'done': self.done,
+                'failed': self.failed,
+                'rows': self.rows,
+                'created': self.created,
+                'started': self.started,
+                'finished': self.finished,
+            }
+
+    def results_from(self, offset=0):
+        with self.lock:
+            return self.results[offset:]
+
+
+class JobManager:
+    """维护任务队列及执行任务的线程"""
+
+    def __init__(self, runners=None, queue_size=None, history=None):
+        self.queue = queue.Queue(maxsize=queue_size or config.job_queue_size)
+        self.jobs = OrderedDict()
+        self.history = history or config.job_history
+        self.lock = threading.Lock()
+        self.threads = []
+        for _ in range(runners or config.job_runners):
+            t = threading.Thread(target=self._loop, daemon=True)
+            t.start()
+            self.threads.append(t)
+
+    def submit(self, template, file_path, workers=None):
+        job = Job(template, file_path, workers)
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            raise QueueFullError(f'任务队列已满（{self.queue.maxsize}），请稍后再试')
+        with self.lock:
+            self.jobs[job.id_] = job
+            self._prune()
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            self._prune()
+            return self.jobs.get(job_id)
+
+    def _prune(self):
+        """只保留最近的若干个已结束任务"""
+        finished = [k for k, j in self.jobs.items() if j.finished is not None]
+        for k in finished[:max(0, len(finished) - self.history)]:
+            del self.jobs[k]
+
+    def _loop(self):
+        while True:
+            job = self.queue.get()
+            try:
+                if not job.cancel_event.is_set():
+                    self._run(job)
+            except Exception as e:
+                # 任务出错只结束该任务，线程继续执行后面的任务
+                print(f'解析任务{job.id_}出错：{type(e).__name__}: {e}')
+                with job.lock:
+                    job.state = 'failed'
+                    job.error = f'{type(e).__name__}: {e}'
+                    job.finished = time.time()
+            finally:
+                self.queue.task_done()
+                with self.lock:
+                    self._prune()
+
+    def _run(self, job):
+        with job.lock:
+            job.state = 'running'
+            job.started = time.time()
+        for result in iter_extract(job.template, job.files, job.workers, job.cancel_event):
+            job.add_result(result)
+        with job.lock:
+            job.state = 'cancelled' if job.cancel_event.is_set() else 'done'
+            job.finished = time.time()
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_manager():
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+    return _manager
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""已解析文件清单
+
+记录每个文件内容的哈希值及解析时的提取器版本，以及该文件写入了哪些行。
+内容未变的文件直接跳过；同一路径的文件内容变化后，先删除上次写入的行再重新写入。
+按业务键写入（config.upsert）时复用的其他文件写入的行改记到本次的路径下，见remember。
+"""
+import hashlib
+import json
+import config
+from utils.registry import EXTRACTOR_VERSION, get_template
+
+TABLE = 'extract_manifest'
+
+_table_ready = False
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def ensure_table(cr):
+    global _table_ready
+    if _table_ready:
+        return
+    cr.execute(f"""create table if not exists `{TABLE}`(
+                `content_hash` char(64) comment '文件内容的sha256',
+                `version` varchar(32) comment '提取器版本',
+                `path` varchar(512) comment '文件路径',
+                `template` varchar(16) comment '模板名称',
+                `row_ids` mediumtext comment '写入的行，JSON格式',
+                `updated` datetime default current_timestamp,
+                primary key (`content_hash`, `version`),
+                key `idx_path` (`path`(191))
+                )
+            """)
+    _table_ready = True
+
+
+def is_extracted(cr, hash_):
+    """内容相同的文件是否已经用当前版本的提取器解析过"""
+    ensure_table(cr)
+    cr.execute(f"select 1 from `{TABLE}` where `content_hash` = %s and `version` = %s",
+               (hash_, EXTRACTOR_VERSION))
+    return cr.fetchone() is not None
+
+
+def forget(cr, path, keep=()):
+    """删除该路径上次解析写入的所有行及其清单记录
+
+    keep中的实体id不删除，也不删除从其发出的关系（按业务键写入时本次复用的实体，见remember）
+    """
+    ensure_table(cr)
+    cr.execute(f"select `row_ids` from `{TABLE}` where `path` = %s", (path,))
+    for (row_ids,) in cr.fetchall():
+        row_ids = json.loads(row_ids)
+        entities = {tab: [i for i in tab_ids if i not in keep] for tab, tab_ids in row_ids['entities'].items()}
+        ids = [i for tab_ids in entities.values() for i in tab_ids]
+        if ids:
+            marks = ','.join(['%s'] * len(ids))
+            for rel_tab in row_ids['relations']:
+                cr.execute(f"delete from `{rel_tab}` where `from_id` in ({marks})", ids)
+        for tab, tab_ids in entities.items():
+            if tab_ids:
+                marks = ','.join(['%s'] * len(tab_ids))
+                cr.execute(f"delete from `{tab}` where `id` in ({marks})", tab_ids)
+    cr.execute(f"delete from `{TABLE}` where `path` = %s", (path,))
+
+
+def remember(cr, path, hash_, name, entity_dict, forget_old=False):
+    """记录该文件本次写入的行
+
+    forget_old为True时先删除该路径上次写入、本次没有复用的行：按业务键写入时upsert复用上次的实体id，
+    所以由调用方先写入本次结果再调用，不能像普通写入那样先forget；
+    按业务键写入时本次可能复用了其他文件写入的行，先从那些文件的记录中去掉，
+    否则那些文件变化后重新解析时会删除现在属于该路径的行
+    """
+    row_ids = written_rows(name, entity_dict)
+    ids = {i for tab_ids in row_ids['entities'].values() for i in tab_ids}
+    if forget_old:
+        forget(cr, path, keep=ids)
+    if config.upsert:
+        _disown(cr, path, ids)
+    remember_many(cr, [(path, hash_, name, row_ids)])
+
+
+def _disown(cr, path, ids):
+    """从其他路径的清单记录中去掉这些实体id"""
+    if not ids:
+        return
+    ensure_table(cr)
+    cr.execute(f"select `content_hash`, `version`, `row_ids` from `{TABLE}` where `path` <> %s and ("
+               + ' or '.join(['`row_ids` like %s'] * len(ids)) + ')',
+               [path] + [f'%"{i}"%' for i in sorted(ids)])
+    for hash_, version, other in cr.fetchall():
+        other = json.loads(other)
+        other['entities'] = {tab: [i for i in tab_ids if i not in ids] for tab, tab_ids in other['entities'].items()}
+        cr.execute(f"update `{TABLE}` set `row_ids` = %s where `content_hash` = %s and `version` = %s",
+                   (json.dumps(other), hash_, version))
+
+
+def remember_many(cr, entries):
+    """记录多个文件写入的行，entries为(路径, 内容哈希, 模板名称, written_rows的结果)"""
+    ensure_table(cr)
+    cr.executemany(f"""replace into `{TABLE}` (`content_hash`, `version`, `path`, `template`, `row_ids`)
+                   values (%s, %s, %s, %s, %s)""",
+                   [(hash_, EXTRACTOR_VERSION, path, name, json.dumps(row_ids))
+                    for path, hash_, name, row_ids in entries])
+
+
+def write_rows(cr, writer, result):
+    """把一个文档的行（见workers.extract_rows）加入writer，
+    result中带有content_hash时删除该路径上次写入的行并记录本次写入的行
+
+    同一批中该路径之前的行还在writer中时先写入，否则forget删不掉这些行，却会删掉它们的清单记录
+    """
+    if 'content_hash' in result:
+        if result['file'] in writer.files:
+            writer.flush()
+        forget(cr, result['file'])
+        remember_many(cr, [(result['file'], result['content_hash'], result['template'], result['row_ids'])])
+    for table, (columns, rows) in result['tables'].items():
+        for row in rows:
+            writer.add(table, columns, row)
+    writer.files.add(result['file'])
+
+
+def written_rows(name, entity_dict, standards=True):
+    """一个文档写入的实体表及其id，以及可能写入的关系表
+
+    standards为False时不包括实体——标准关系表；不准备模板，不访问数据库，
+    standards为True时调用方须已准备好模板（见registry.get_template），通常在事务中调用
+    """
+    template = get_template(name, prepare=False)
+    scheme_id = template.module.SCHEME_ID
+    entities = {}
+    for value in entity_dict.values():
+        for entity in value if isinstance(value, list) else [value]:
+            entities.setdefault(scheme_id + '_' + entity.class_, []).append(entity.id_)
+    return {'entities': entities, 'relations': template.relation_tables(standards)}
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""迁移已有的表，使其与本体模型生成的表结构（见utils.schema）一致
+
+用法：python -m utils.migrate [--dry-run]
+--dry-run时只打印要执行的语句。
+"""
+import sys
+from utils.db import connection
+from utils.registry import all_names, load_module
+from utils.schema import get_registry, relation_table, template_tables
+
+
+def all_tables():
+    """所有模板的表：表名 -> 定义，包括数据库中已有的实体——标准关系表"""
+    registry = get_registry()
+    tables = {}
+    for name in all_names():
+        module = load_module(name)
+        tables.update(template_tables(module.SCHEME_ID, module.classes, module.data_properties,
+                                      module.object_properties))
+        # 实体——标准关系表取决于标准表中的数据，只迁移已经建立的
+        for class_ in getattr(module, 'class_std', None) or {}:
+            for range_ in ('bz_tab', 'bz_1_info', 'bz_2_info'):
+                table = module.SCHEME_ID + '_' + class_ + '_2_' + range_
+                if registry.tables is not None and table.lower() in registry.tables:
+                    tables[table] = relation_table('reference')
+    return tables
+
+
+def migrate(dry_run=False):
+    """为已有的表修改字段类型、补充字段、主键及索引，并建立缺少的表"""
+    registry = get_registry()
+    failed = 0
+    with connection() as conn:
+        cr = conn.cursor()
+        registry.reload(cr)
+        for table, definition in all_tables().items():
+            if table.lower() not in registry.tables:
+                print(f'建表：{table}')
+                if not dry_run:
+                    registry.ensure_table(cr, table, definition)
+                continue
+            sql = registry.migration(cr, table, definition)
+            if sql is None:
+                continue
+            print(sql)
+            if dry_run:
+                continue
+            try:
+                cr.execute(sql)
+            except Exception as e:
+                # 常见原因是id有重复或为空，无法建立主键，需要先清理数据
+                failed += 1
+                print(f'迁移失败：{table}：{type(e).__name__}: {e}')
+    registry.invalidate()
+    return failed
+
+
+if __name__ == '__main__':
+    sys.exit(1 if migrate(dry_run='--dry-run' in sys.argv[1:]) else 0)
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""解析与写入分离的两级流水线
+
+解析（CPU密集）交给进程池，每个工作进程只解析文档并返回要写入的行（见workers.extract_rows）；
+写入（I/O密集）由config.pipeline_writers个写入线程完成，两者之间是一个有界队列。
+队列满时主进程不再从进程池取结果，进程池也就不再接收新的文件，数据库变慢时内存不会无限增长。
+
+每个写入线程把若干文档合并为一个事务（与extract_batch相同，按config.group_commit_docs及
+config.group_commit_ms），整组的行按表一起批量写入；写入出错时回滚整组，再逐个文档用保存点重写，
+只有出错的文档记为失败。写入线程按行插入，不支持按业务键写入（config.upsert）。
+"""
+import queue
+import threading
+import time
+import config
+from utils import manifest
+from utils.db import connection
+from utils.writer import BulkWriter
+from utils.workers import extract_rows, iter_tasks
+
+_STOP = object()
+
+
+class Pipeline:
+    """实例执行一次解析及写入，results中为每个文件的处理结果"""
+
+    def __init__(self, name, file_paths, workers=None, writers=None, cancel_event=None):
+        if config.upsert:
+            raise RuntimeError('流水线模式按行插入，不支持按业务键写入（config.upsert），请关闭upsert或使用普通模式')
+        self.name = name
+        self.file_paths = file_paths
+        self.workers = workers or config.workers
+        self.writers = writers or config.pipeline_writers
+        self.cancel_event = cancel_event
+        self.parsed = queue.Queue(maxsize=config.pipeline_queue_size)
+        self.results = queue.Queue()
+        self.error = None
+
+    def run(self):
+        """按完成的先后逐个返回每个文件的处理结果"""
+        threads = [threading.Thread(target=self._write, daemon=True) for _ in range(self.writers)]
+        for t in threads:
+            t.start()
+        producer = threading.Thread(target=self._parse, daemon=True)
+        producer.start()
+        running = self.writers
+        while running:
+            result = self.results.get()
+            if result is _STOP:
+                running -= 1
+                continue
+            yield result
+        producer.join()
+        if self.error is not None:
+            raise self.error
+
+    def _parse(self):
+        try:
+            tasks = ((extract_rows, self.name, file_path) for file_path in self.file_paths)
+            for result in iter_tasks(tasks, self.workers, self.cancel_event, ordered=False):
+                if result['state'] and not result.get('skipped'):
+                    self.parsed.put(result)  # 队列满时在此等待
+                else:
+                    self.results.put(result)
+        except Exception as e:
+            self.error = e
+        finally:
+            for _ in range(self.writers):
+                self.parsed.put(_STOP)
+
+    def _write(self):
+        stopped = False
+        try:
+            with connection() as conn:
+                if config.manifest:
+                    # 建表语句会隐式提交事务，所以在写入前确保清单表存在
+                    manifest.ensure_table(conn.cursor())
+                stopped = self._write_loop(conn)
+        except Exception as e:
+            # 无法连接数据库时，其余文档均记为失败，并继续取走队列中的文档以免解析端阻塞
+            if not stopped:
+                self._drain(f'{type(e).__name__}: {e}')
+        finally:
+            self.results.put(_STOP)
+
+    def _write_loop(self, conn):
+        group = []
+        started = 0
+        while True:
+            timeout = None
+            if group:
+                timeout = max(0, config.group_commit_ms / 1000 - (time.monotonic() - started))
+            try:
+                item = self.parsed.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                if group:
+                    self._commit(conn, group)
+                return True
+            if item is not None:
+                if not group:
+                    started = time.monotonic()
+                group.append(item)
+            if group and (item is None or len(group) >= config.group_commit_docs
+                          or time.monotonic() - started >= config.group_commit_ms / 1000):
+                self._commit(conn, group)
+                group = []
+
+    def _drain(self, msg):
+        while True:
+            item = self.parsed.get()
+            if item is _STOP:
+                return
+            item.update(state=0, msg=msg, rows=0)
+            self.results.put(item)
+
+    def _commit(self, conn, group):
+        """在一个事务中写入一组文档，出错时回滚并逐个文档重写"""
+        cr = conn.cursor()
+        try:
+            conn.begin()
+            writer = BulkWriter(cr)
+            for result in group:
+                manifest.write_rows(cr, writer, result)
+            writer.flush()
+            conn.commit()
+        except Exception:
+            _rollback(conn)
+            self._commit_each(conn, group)
+            return
+        for result in group:
+            self.results.put(result)
+
+    def _commit_each(self, conn, group):
+        cr = conn.cursor()
+        try:
+            conn.begin()
+            for result in group:
+                cr.execute('savepoint pipeline_item')
+                try:
+                    writer = BulkWriter(cr)
+                    manifest.write_rows(cr, writer, result)
+                    writer.flush()
+                except Exception as e:
+                    cr.execute('rollback to savepoint pipeline_item')
+                    result.update(state=0, msg=f'{type(e).__name__}: {e}', rows=0)
+            conn.commit()
+        except Exception as e:
+            _rollback(conn)
+            for result in group:
+                result.update(state=0, msg=f'{type(e).__name__}: {e}', rows=0)
+        for result in group:
+            self.results.put(result)
+
+
+def _rollback(conn):
+    try:
+        conn.rollback()
+    except Exception:
+        pass
+
+
+def iter_pipeline(name, file_paths, workers=None, writers=None, cancel_event=None):
+    """用两级流水线解析并写入多个文件，按完成的先后逐个返回每个文件的处理结果"""
+    for result in Pipeline(name, file_paths, workers, writers, cancel_event).run():
+        for key in ('tables', 'content_hash', 'row_ids'):
+            result.pop(key, None)
+        yield result
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""模板注册表
+
+将模板名称映射到utils/specs下的声明式模板（见utils.spec_engine），或utils下对应的解析模块。
+声明式模板在第一次用到时编译（模块在第一次用到时才导入），之后执行一次
+std_rel/initialize，并将结果缓存在进程内，之后的调用直接复用已加载的模板。
+std_rel/initialize需要数据库，写前日志模式下解析时可以只加载模板（见get_template的prepare），
+实体——标准关系的行由重放时补上（见standard_rows）。
+"""
+import importlib
+import threading
+from utils import initialize, spec_engine, std_rel
+from utils.standards import current_version
+from utils.writer import REL_COLUMNS, iter_rows, iter_standard_rows
+
+# 模板名称 -> utils下的解析模块，所有模板都已改为声明式模板，新的模板也可以写成解析模块注册在这里
+TEMPLATES = {}
+
+# 声明式模板：模板名称 -> utils/specs下的JSON文件
+SPECS = spec_engine.discover()
+
+# 提取器版本，解析逻辑变化导致结果不同时加一，已解析过的文件会重新解析
+EXTRACTOR_VERSION = '2'
+
+# 模板名称为AUTO时根据文档内容自动识别模板
+AUTO = 'AUTO'
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+class Template:
+    """实例表示一个已加载的模板，保存模块本身及其与标准之间的关系"""
+
+    def __init__(self, name, module):
+        self.name = name
+        self.module = module
+        self.object_properties1 = None
+        self.class_std_id = None
+        self.standards_version = None  # 查找引用的标准时标准目录的版本
+        self.prepared = False
+        self.lock = threading.Lock()
+
+    def prepare(self):
+        """查找引用的标准并建表（需要数据库）
+
+        建表只执行一次；标准目录重新加载后（见utils.standards）重新查找引用的标准
+        """
+        if self.prepared and not self._standards_changed():
+            return
+        with self.lock:
+            module = self.module
+            if getattr(module, 'class_std', None):
+                version = current_version()
+                if version != self.standards_version:
+                    self.object_properties1, self.class_std_id = std_rel(module.SCHEME_ID, module.class_std)
+                    self.standards_version = version
+            if not self.prepared:
+                initialize(module.SCHEME_ID, module.classes, module.data_properties, module.object_properties)
+                self.prepared = True
+
+    def _standards_changed(self):
+        return bool(getattr(self.module, 'class_std', None)) and current_version() != self.standards_version
+
+    def read_file(self, file_path):
+        return self.module.read_file(file_path)
+
+    def save(self, entity_dict, conn=None):
+        if self.class_std_id is None:
+            self.module.save(entity_dict, conn=conn)
+        else:
+            self.module.save(entity_dict, self.object_properties1, self.class_std_id, conn=conn)
+
+    def rows(self, entity_dict, standards=True):
+        """该文档要写入的所有行，见writer.iter_rows；standards为False时不包括实体——标准关系的行"""
+        if not standards:
+            return iter_rows(self.module.SCHEME_ID, entity_dict, self.module.object_properties)
+        return iter_rows(self.module.SCHEME_ID, entity_dict, self.module.object_properties,
+                         self.object_properties1, self.class_std_id)
+
+    def standard_rows(self, tables):
+        """tables（见tables(entity_dict, standards=False)）中的实体与标准的关系对应的行"""
+        entity_ids = {}
+        for class_ in self.module.classes:
+            table = tables.get(self.module.SCHEME_ID + '_' + class_)
+            if table is not None:
+                columns, rows = table
+                i = columns.index('id')
+                entity_ids[class_] = [row[i] for row in rows]
+        return iter_standard_rows(self.module.SCHEME_ID, entity_ids, self.object_properties1, self.class_std_id)
+
+    def relation_tables(self, standards=True):
+        """可能写入的关系表，standards为False时不包括实体——标准关系表"""
+        rels = [self.module.object_properties, self.object_properties1 or {}] if standards else \
+            [self.module.object_properties]
+        return sorted({self.module.SCHEME_ID + '_' + rel['domain'] + '_2_' + rel['range']
+                       for r in rels for rel in r.values()})
+
+    def columns(self):
+        """表名 -> 字段，顺序与utils.initialize建表时一致"""
+        module = self.module
+        columns = {}
+        for class_ in module.classes:
+            columns[module.SCHEME_ID + '_' + class_] = ['id'] + [
+                pro for pro in module.data_properties if module.data_properties[pro]['domain'] == class_]
+        for rels in (module.object_properties, self.object_properties1 or {}):
+            for rel in rels.values():
+                columns[module.SCHEME_ID + '_' + rel['domain'] + '_2_' + rel['range']] = REL_COLUMNS
+        return columns
+
+    def tables(self, entity_dict, standards=True):
+        """该文档要写入的行按表归并：表名 -> (字段, 行)，字段为columns()中该表的全部字段，行按其顺序补齐"""
+        all_columns = self.columns()
+        tables = {}
+        for table, columns, row in self.rows(entity_dict, standards):
+            table_columns = all_columns[table]
+            full = [None] * len(table_columns)
+            for column, value in zip(columns, row):
+                full[table_columns.index(column)] = value
+            tables.setdefault(table, (table_columns, []))[1].append(full)
+        return tables
+
+
+def all_names():
+    """所有模板的名称"""
+    return list(TEMPLATES) + [name for name in SPECS if name not in TEMPLATES]
+
+
+def is_supported(name):
+    return name == AUTO or name in TEMPLATES or name in SPECS
+
+
+def load_module(name):
+    """导入模板的解析模块，声明式模板返回编译好的对象，二者的接口相同"""
+    if name in TEMPLATES:
+        return importlib.import_module(TEMPLATES[name])
+    return spec_engine.load(SPECS[name])
+
+
+def get_template(name, prepare=True):
+    """获取模板，首次调用时导入模块
+
+    prepare为True时确保已查找引用的标准并建好相关表（见Template.prepare），需要数据库
+    """
+    template = _loaded.get(name)
+    if template is None:
+        with _lock:
+            template = _loaded.get(name)
+            if template is None:
+                template = Template(name, load_module(name))
+                _loaded[name] = template
+    if prepare:
+        template.prepare()
+    return template
+
+
+def preload(names=None, prepare=True):
+    """预先加载指定的模板（默认全部）"""
+    for name in names or all_names():
+        get_template(name, prepare)
+
+
+def count_rows(entity_dict):
+    """统计提取出的实体数量（即写入实体表的行数）"""
+    rows = 0
+    for value in entity_dict.values():
+        rows += len(value) if isinstance(value, list) else 1
+    return rows
+
+
+def serialize(entity_dict):
+    """将提取出的实体转换为可JSON序列化的形式：概念名 -> 属性（多个实体时为列表）"""
+    result = {}
+    for value in entity_dict.values():
+        if isinstance(value, list):
+            for entity in value:
+                result.setdefault(entity.class_, []).append(dict(entity.pros, id=entity.id_))
+        else:
+            result[value.class_] = dict(value.pros, id=value.id_)
+    return result
+
+
+def extract_file(name, file_path, conn=None):
+    """用指定模板解析一个文件并入库，返回提取出的实体；文件无法打开时返回None
+
+    传入conn时使用该连接写入且不提交事务；调用方此时通常已开始事务，建表语句会隐式提交事务，
+    所以不准备模板，须在事务开始前调用get_template
+    """
+    template = get_template(name, prepare=conn is None)
+    entity_dict = template.read_file(file_path)
+    if entity_dict is None:
+        return
+    template.save(entity_dict, conn)
+    return entity_dict
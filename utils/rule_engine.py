@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""段落定位规则
+
+供电方案类模板用一组规则定位段落：每条规则有一个location_rule正则表达式，从段落开头匹配；
+match_once为True的规则只取第一个匹配的段落。原先每条规则各自从头扫描一遍所有段落，
+这里在导入时编译好所有规则，只扫描一遍段落，再按规则的顺序返回匹配结果，
+与依次对每条规则扫描所有段落得到的(规则, 段落)及其先后完全相同。
+
+每条规则先从表达式中取出固定的文字：开头的前缀，及之后一定会出现的子串（见literals）。
+段落的第一个字只可能匹配前缀以这个字开头的规则及没有前缀的规则，按第一个字把规则分组，
+每组合成一个正则表达式（每条规则为一个命名分组，按规则的顺序组成分支），对每个段落只匹配所在的一组：
+没有匹配时该段落不匹配任何规则；匹配时lastgroup即为第一条匹配的规则，其前面的规则都不匹配，
+其后面的规则先检查前缀和子串，都出现时才用正则表达式检查。
+match_once的规则匹配到后即从分组中去掉，按还需要匹配的规则缓存分组。
+规则中含有无法合并的写法（如内联标志、同名的命名分组）时每组逐条检查。
+"""
+import re
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # Python 3.10及以前
+    import sre_constants
+    import sre_parse
+
+# 每个规则集最多缓存的分组个数
+_MAX_CACHED = 256
+
+
+def literals(pattern):
+    """表达式中固定的文字：(开头的前缀, 之后一定会出现的子串列表)
+
+    只取表达式最外层依次出现的字符，分支、分组、重复中的字符不计入；忽略大小写时没有固定的文字
+    """
+    parsed = sre_parse.parse(pattern)
+    if parsed.state.flags & re.IGNORECASE:
+        return '', []
+    prefix = None
+    substrings = []
+    chars = []
+    for op, av in parsed:
+        if op is sre_constants.LITERAL:
+            chars.append(chr(av))
+            continue
+        if prefix is None:
+            prefix = ''.join(chars)
+        elif chars:
+            substrings.append(''.join(chars))
+        chars = []
+    if prefix is None:
+        return ''.join(chars), []
+    if chars:
+        substrings.append(''.join(chars))
+    return prefix, substrings
+
+
+class RuleSet:
+    """实例保存编译好的一组规则"""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.patterns = [re.compile(rule['location_rule']) for rule in rules]
+        self.match_once = [rule['match_once'] for rule in rules]
+        self.literals = [literals(rule['location_rule']) for rule in rules]
+        try:
+            self._compile(range(len(rules)))
+            self.mergeable = True
+        except re.error:
+            self.mergeable = False
+        self.groups = {}  # 还需要匹配的规则 -> (段落的第一个字 -> 分组, 其他段落的分组)
+
+    def _compile(self, candidates):
+        return re.compile('|'.join(f"(?P<_rule{i}>{self.rules[i]['location_rule']})" for i in candidates))
+
+    def _group(self, candidates):
+        """一组候选规则及合成的表达式，没有候选规则时为None"""
+        if not candidates:
+            return None
+        return candidates, self._compile(candidates) if self.mergeable else None
+
+    def _groups(self, active):
+        if active not in self.groups:
+            if len(self.groups) >= _MAX_CACHED:
+                self.groups.clear()
+            floating = [i for i in active if not self.literals[i][0]]
+            by_first = {}
+            for i in active:
+                prefix = self.literals[i][0]
+                if prefix:
+                    by_first.setdefault(prefix[0], []).append(i)
+            self.groups[active] = ({c: self._group(tuple(sorted(found + floating))) for c, found in by_first.items()},
+                                   self._group(tuple(floating)))
+        return self.groups[active]
+
+    def _match(self, i, text):
+        prefix, substrings = self.literals[i]
+        if not text.startswith(prefix):
+            return False
+        for s in substrings:
+            if s not in text:
+                return False
+        return self.patterns[i].match(text) is not None
+
+    def scan(self, paragraphs):
+        """扫描一遍段落，按规则的顺序返回(规则, 段落)，同一规则的段落按其在文档中的顺序"""
+        matches = [[] for _ in self.rules]
+        active = tuple(range(len(self.rules)))  # 还需要继续匹配的规则
+        by_first, others = self._groups(active)
+        for p in paragraphs:
+            text = p.text
+            group = by_first.get(text[:1], others)
+            if group is None:
+                continue
+            candidates, combined = group
+            first = -1
+            if combined is not None:
+                m = combined.match(text)
+                if m is None:
+                    continue
+                first = int(m.lastgroup[len('_rule'):])
+            matched_once = False
+            for i in candidates:
+                if i == first or (i > first and self._match(i, text)):
+                    matches[i].append(p)
+                    matched_once = matched_once or self.match_once[i]
+            if matched_once:
+                active = tuple(i for i in active if not (matches[i] and self.match_once[i]))
+                if not active:
+                    break
+                by_first, others = self._groups(active)
+        for rule, found in zip(self.rules, matches):
+            for p in found:
+                yield rule, p
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""表结构
+
+表结构由本体模型生成：实体表的字段类型取决于data_properties中的range（见COLUMN_TYPES），
+以id为主键，application_number等字段建立索引；关系表以id为主键，from_id、to_id各建立索引。
+
+每个进程第一次建表前从information_schema读取当前库中已有的表、字段及索引并缓存，
+之后只对缺少的表执行create table，对已有的表只用alter table补充本体模型中新增的字段；
+表结构与缓存一致时不再向数据库发送任何DDL。
+修改已有字段的类型、为已有的表补建主键及索引可能耗时较长，不在解析时自动进行，
+需要手动执行迁移：python -m utils.migrate [--dry-run]
+
+表名及字段名一律按小写比较，与MySQL的lower_case_table_names设置无关。
+"""
+import re
+import threading
+from utils.db import connection
+
+# data_properties中range -> 字段类型，未列出的range按字符串处理；
+# 声明为数值或日期类型的属性，提取出的值须是MySQL能够直接转换的格式
+COLUMN_TYPES = {
+    'string': 'varchar(255)',
+    'text': 'text',
+    'int': 'bigint',
+    'integer': 'bigint',
+    'float': 'double',
+    'decimal': 'decimal(20,4)',
+    'date': 'date',
+    'datetime': 'datetime',
+    'bool': 'tinyint(1)',
+}
+
+# 实体表中需要建立索引的字段
+INDEXED_COLUMNS = ['application_number']
+
+
+def column_type(range_):
+    return COLUMN_TYPES.get(range_, COLUMN_TYPES['string'])
+
+
+def entity_table(class_, data_properties):
+    """实体表的定义：(字段列表, 索引列表)，字段为(字段名, 类型, 其他定义)，索引为(索引名, 定义)"""
+    columns = [('id', 'varchar(255)', "not null comment '唯一标识'")]
+    indexes = [('PRIMARY', 'primary key (`id`)')]
+    for pro in data_properties:
+        if data_properties[pro]['domain'] == class_:
+            columns.append((pro, column_type(data_properties[pro].get('range')),
+                            f"comment '{data_properties[pro]['desc']}'"))
+            if pro in INDEXED_COLUMNS:
+                indexes.append((f'idx_{pro}', f'key `idx_{pro}` (`{pro}`)'))
+    return columns, indexes
+
+
+def relation_table(rel_name):
+    """关系表的定义，格式同entity_table"""
+    columns = [
+        ('id', 'varchar(255)', 'not null'),
+        ('from_id', 'varchar(255)', ''),
+        ('to_id', 'varchar(255)', ''),
+        ('rel_name', 'varchar(10)', f"default '{rel_name}'"),
+    ]
+    indexes = [
+        ('PRIMARY', 'primary key (`id`)'),
+        ('idx_from_id', 'key `idx_from_id` (`from_id`)'),
+        ('idx_to_id', 'key `idx_to_id` (`to_id`)'),
+    ]
+    return columns, indexes
+
+
+def template_tables(scheme_id, classes, data_properties, object_properties):
+    """一个模板的所有实体表及关系表：表名 -> 定义"""
+    tables = {}
+    for class_ in classes:
+        tables[scheme_id + '_' + class_] = entity_table(class_, data_properties)
+    for rel in object_properties.values():
+        tables[scheme_id + '_' + rel['domain'] + '_2_' + rel['range']] = relation_table(rel['name'])
+    return tables
+
+
+def _normalize_type(type_):
+    # MySQL 5.7返回的整数类型带显示宽度，如bigint(20)
+    type_ = type_.lower().replace(' ', '')
+    return re.sub(r'^(bigint|int|smallint)\(\d+\)', r'\1', type_)
+
+
+def _column_sql(column):
+    name, type_, extra = column
+    return f'`{name}` {type_} {extra}'.rstrip()
+
+
+class SchemaRegistry:
+    """实例缓存当前库中的表 -> {'columns': 字段 -> 类型, 'indexes': 索引名}"""
+
+    def __init__(self):
+        self.tables = None
+        self.lock = threading.Lock()
+
+    def _load(self, cr):
+        cr.execute("""select `table_name`, `column_name`, `column_type` from information_schema.columns
+                   where `table_schema` = database()""")
+        tables = {}
+        for table, column, type_ in cr.fetchall():
+            tables.setdefault(table.lower(), {'columns': {}, 'indexes': set()})['columns'][column.lower()] = type_
+        cr.execute("""select distinct `table_name`, `index_name` from information_schema.statistics
+                   where `table_schema` = database()""")
+        for table, index in cr.fetchall():
+            if table.lower() in tables:
+                tables[table.lower()]['indexes'].add(index.lower())
+        self.tables = tables
+
+    def is_complete(self, table, definition):
+        """缓存中该表是否已包含定义中的所有字段"""
+        existing = self.tables.get(table.lower()) if self.tables is not None else None
+        return existing is not None and all(c[0].lower() in existing['columns'] for c in definition[0])
+
+    def ensure_table(self, cr, table, definition):
+        """确保表存在且包含定义中的所有字段
+
+        注意DDL会隐式提交当前事务，不要在事务中调用
+        """
+        columns, indexes = definition
+        with self.lock:
+            if self.tables is None:
+                self._load(cr)
+            existing = self.tables.get(table.lower())
+            if existing is None:
+                fields = ','.join([_column_sql(c) for c in columns] + [sql for _, sql in indexes])
+                cr.execute(f'create table if not exists `{table}`({fields})')
+                self.tables[table.lower()] = {'columns': {c[0].lower(): c[1] for c in columns},
+                                              'indexes': {name.lower() for name, _ in indexes}}
+                return
+            missing = [c for c in columns if c[0].lower() not in existing['columns']]
+            if missing:
+                cr.execute(f'alter table `{table}` ' + ', '.join(f'add column {_column_sql(c)}' for c in missing))
+                existing['columns'].update((c[0].lower(), c[1]) for c in missing)
+
+    def migration(self, cr, table, definition):
+        """使已有的表与定义一致所需的alter语句，表不存在或已一致时返回None"""
+        with self.lock:
+            if self.tables is None:
+                self._load(cr)
+            existing = self.tables.get(table.lower())
+        if existing is None:
+            return
+        columns, indexes = definition
+        clauses = []
+        for column in columns:
+            current = existing['columns'].get(column[0].lower())
+            if current is None:
+                clauses.append(f'add column {_column_sql(column)}')
+            elif _normalize_type(current) != _normalize_type(column[1]):
+                clauses.append(f'modify column {_column_sql(column)}')
+        for name, sql in indexes:
+            if name.lower() not in existing['indexes']:
+                clauses.append(f'add {sql}')
+        if clauses:
+            return f'alter table `{table}` ' + ', '.join(clauses)
+
+    def reload(self, cr):
+        with self.lock:
+            self._load(cr)
+
+    def invalidate(self):
+        """表结构被其他程序修改后调用，下次建表前重新读取"""
+        with self.lock:
+            self.tables = None
+
+
+_registry = SchemaRegistry()
+
+
+def get_registry():
+    return _registry
+
+
+def ensure_tables(tables):
+    """确保多张表存在且字段完整，tables为 表名 -> 定义；都已存在时不会取连接"""
+    registry = get_registry()
+    with registry.lock:
+        if all(registry.is_complete(table, definition) for table, definition in tables.items()):
+            return
+    with connection() as conn:
+        cr = conn.cursor()
+        for table, definition in tables.items():
+            registry.ensure_table(cr, table, definition)
@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+"""声明式模板
+
+每个模板为utils/specs下的一个JSON文件（文件名即模板名称），注册表（见utils.registry）自动发现这些文件，
+在第一次用到时编译成与解析模块接口相同的对象，新增模板不需要写Python代码。
+
+JSON中的字段：
+- scheme_id、classes、data_properties、class_std：同解析模块，object_properties为列表；
+- defaults：属性 -> 默认值（通常为引用的标准），文档中没有取到值的属性及constants使用；
+- table：从文档的第index个表格中按行取值，单元格为合并后的（见utils.table_grid），文本去掉首尾空白：
+  - entities：预先创建的实体，每类一个，按顺序；
+  - rows：每项为{"row": 行号, "class": 类名, "columns": 每列对应的属性，null表示该列不取}，
+    "repeat"为true时从该行起每行一个实体，直到"end"行（不含，可以为负数，默认为表格结束），各列都为空的行跳过；
+    "stop_at_blank"为true时遇到各列都为空的行即结束；其间的行不再按行号取值；
+  - fields：按顺序在rows之后取值，每项为{"class": 类名, "pro": 属性}及以下之一，单元格的文字去掉全部空白：
+    - label：标签单元格的文字，值在其后的单元格中；单元格为「标签：值」时值即冒号之后的部分。
+      同一标签出现多次时"nth"指定第几个（从0开始）；"join"为true时值为其后直到下一个标签的所有单元格，
+      否则只取下一个单元格；"below"为true时值为其下方的单元格；标签单元格纵向合并时依次拼接各行的值；
+    - cell：[行号, 该行第几个单元格]，值即该单元格；
+    - pairs：[起始行, 结束行（不含）]，值为列表，每个非空行一项：该行的「标签 值」单元格及「标签：值」
+      （一个单元格中可以有多个，以空白分隔，标签中不能有空白）组成的字典；
+    另可以有"regex"：从取到的值中查找，值改为第一个分组（没有分组时为匹配的部分），找不到时为空；
+    文档中没有的标签取defaults中的值或空字符串；类为repeat的实体时每个实体都记入该属性；
+- paragraphs：段落规则（见utils.rule_engine），值为段落中依次出现的下划线的内容，另有：
+  - prefix：放在下划线的值之前的值，每项为{"value": 固定值}或{"regex": 表达式}（取从段落开头匹配的第一个分组）；
+  - skip：跳过开头的若干个下划线；
+  - repeat：为true时每个匹配的段落一个实体，否则同一类的属性都记入同一个实体；
+- constants：[[类名, 属性], ...]，表格和段落都读完后依次从defaults取值；
+- title、table_labels：自动识别模板用的标题及第一个表格中特有的标签单元格（见utils.detect）。
+"""
+import json
+import os
+import re
+from uuid import uuid1
+from utils import read_docx
+from utils.db import connection
+from utils.rule_engine import RuleSet
+from utils.table_grid import TableGrid
+from utils.writer import write
+
+SPEC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'specs')
+
+
+class Entity:
+    """实例表示从模板中提取出来的一个实体"""
+
+    def __init__(self, class_, id_):
+        self.class_ = class_
+        self.pros = {}
+        self.id_ = id_
+
+    def add_pro(self, key, value):
+        if isinstance(key, str) and isinstance(value, (str, list)):
+            if key in self.pros:
+                if not self.pros[key]:
+                    self.pros[key] = value
+                else:
+                    if value:
+                        self.pros[key] += '/' + value
+            else:
+                self.pros.update({key: value})
+        else:
+            raise TypeError(f'属性名须为字符串，值须为字符串或列表：{key!r}')
+
+
+def cluster_underline(runs):
+    """对一个段落的runs按照下划线进行聚合，连续的带下划线的run为一个值"""
+    texts = []
+    text = None
+    for run in runs:
+        if run.underline:
+            text = run.text.strip() if text is None else text + run.text.strip()
+        elif text is not None:
+            texts.append(text)
+            text = None
+    if text is not None:
+        texts.append(text)
+    return texts
+
+
+def _single(entity_dict, class_):
+    entity = entity_dict.get(class_)
+    if entity is None:
+        entity = entity_dict[class_] = Entity(class_, uuid1().hex)
+    return entity
+
+
+_blank = re.compile(r'\s+')
+# 一个单元格中的「标签：值」，值到下一个「标签：」之前的空白为止
+_pair = re.compile(r'([^\s：]+)：(.*?)(?=\s+[^\s：]+：|$)', re.S)
+
+
+def _text(cell):
+    return _blank.sub('', cell.text)
+
+
+def _split_label(text):
+    """单元格的文字拆成(标签, 同一单元格中的值)，值不在同一单元格中时为None"""
+    label, sep, value = text.partition('：')
+    return label, value if sep and value else None
+
+
+def _find_labels(table, labels):
+    """表格中的标签单元格：标签 -> [(行, 该行第几个单元格, 同一单元格中的值)]，按在表格中的先后"""
+    found = {}
+    for r in range(len(table)):
+        for i, cell in enumerate(table.visible(r)):
+            label, value = _split_label(_text(cell))
+            if label in labels:
+                found.setdefault(label, []).append((r, i, value))
+    return found
+
+
+def _next_value(table, r, i, join, labels):
+    texts = []
+    for cell in table.visible(r)[i + 1:]:
+        text = _text(cell)
+        if _split_label(text)[0] in labels:
+            break
+        texts.append(text)
+        if not join:
+            break
+    return ''.join(texts)
+
+
+def _label_value(table, r, i, join, labels):
+    """标签单元格之后的值，标签单元格纵向合并时拼接各行的值"""
+    value = _next_value(table, r, i, join, labels)
+    head = table.row(r)[i]
+    for k in range(r + 1, len(table)):
+        j = next((j for j, cell in enumerate(table.row(k)) if cell is head), None)
+        if j is None:
+            break
+        value += _next_value(table, k, j, join, labels)
+    return value
+
+
+def _pairs(table, r):
+    pairs = {}
+    cells = table.visible(r)
+    i = 0
+    while i < len(cells):
+        if '：' in cells[i].text:
+            for label, value in _pair.findall(cells[i].text):
+                pairs[label] = _blank.sub('', value)
+            i += 1
+        else:
+            pairs[_text(cells[i])] = _text(cells[i + 1]) if i + 1 < len(cells) else ''
+            i += 2
+    return pairs
+
+
+def _compile_field(field, labels, defaults):
+    """编译fields中的一项，返回value(table, found)，found见_find_labels"""
+    pro = field['pro']
+    pattern = re.compile(field['regex']) if 'regex' in field else None
+
+    def raw(table, found):
+        if 'cell' in field:
+            r, i = field['cell']
+            return _text(table.row(r)[i])
+        if 'pairs' in field:
+            start, end = field['pairs']
+            return [_pairs(table, r) for r in range(len(table))[start:end]
+                    if any(_text(cell) for cell in table.visible(r))]
+        positions = found.get(field['label'], [])
+        nth = field.get('nth', 0)
+        if nth >= len(positions):
+            return defaults.get(pro, '')
+        r, i, value = positions[nth]
+        if value is not None:
+            return value
+        if field.get('below'):
+            cell = table.cell(r + 1, table.column(r, i))
+            return '' if cell is None else _text(cell)
+        return _label_value(table, r, i, field.get('join', False), labels)
+
+    def value(table, found):
+        v = raw(table, found)
+        if pattern is not None:
+            m = pattern.search(v)
+            v = '' if m is None else m.group(1) if pattern.groups else m.group()
+        return v
+    return value
+
+
+def _compile_table(spec, defaults):
+    """编译表格部分，返回read(docx, entity_dict)"""
+    index = spec.get('index', 0)
+    entities = spec.get('entities', [])
+    rows = {}  # 行号 -> [(类名, [(列, 属性)])]
+    blocks = {}  # 起始行号 -> (类名, [(列, 属性)], 结束行号, 是否遇到空行即结束)
+    for item in spec.get('rows', []):
+        fields = [(col, pro) for col, pro in enumerate(item['columns']) if pro]
+        if item.get('repeat'):
+            blocks[item['row']] = (item['class'], fields, item.get('end'), item.get('stop_at_blank', False))
+        else:
+            rows.setdefault(item['row'], []).append((item['class'], fields))
+    labels = {field['label'] for field in spec.get('fields', []) if 'label' in field}
+    fields = [(field['class'], field['pro'], _compile_field(field, labels, defaults))
+              for field in spec.get('fields', [])]
+
+    def read(docx, entity_dict):
+        table = TableGrid(docx.tables[index])
+        for class_ in entities:
+            _single(entity_dict, class_)
+        for class_, _, _, _ in blocks.values():
+            entity_dict.setdefault(class_, [])
+        r = 0
+        while r < len(table):
+            if r in blocks:
+                class_, columns, end, stop_at_blank = blocks[r]
+                stop = len(table) if end is None else end if end >= 0 else len(table) + end
+                while r < stop:
+                    texts = [cell.text.strip() for cell in table.row(r)]
+                    r += 1
+                    values = [(pro, texts[col] if col < len(texts) else '') for col, pro in columns]
+                    if not any(v for _, v in values):
+                        if stop_at_blank:
+                            break
+                        continue
+                    entity = Entity(class_, uuid1().hex)
+                    for pro, v in values:
+                        entity.add_pro(pro, v)
+                    entity_dict[class_].append(entity)
+                continue
+            if r in rows:
+                texts = [cell.text.strip() for cell in table.row(r)]
+                for class_, columns in rows[r]:
+                    entity = _single(entity_dict, class_)
+                    for col, pro in columns:
+                        entity.add_pro(pro, texts[col])
+            r += 1
+        found = _find_labels(table, labels) if labels else {}
+        for class_, pro, value in fields:
+            v = value(table, found)
+            targets = entity_dict.get(class_)
+            for entity in targets if isinstance(targets, list) else [_single(entity_dict, class_)]:
+                entity.add_pro(pro, v)
+    return read
+
+
+def _prefix(item):
+    if 'regex' not in item:
+        value = item['value']
+        return lambda text: value
+    pattern = re.compile(item['regex'])
+
+    def group(text):
+        m = pattern.match(text)
+        return m.group(1) if m else ''
+    return group
+
+
+def _compile_rule(rule, defaults):
+    """编译一条段落规则，返回extract(段落, entity_dict)"""
+    class_ = rule['class']
+    pros = rule['pros']
+    prefix = [_prefix(item) for item in rule.get('prefix', [])]
+    skip = rule.get('skip', 0)
+    repeat = rule.get('repeat', False)
+
+    def extract(p, entity_dict):
+        values = [f(p.text) for f in prefix] + cluster_underline(p.runs)[skip:]
+        if repeat:
+            entity = Entity(class_, uuid1().hex)
+            entity_dict.setdefault(class_, []).append(entity)
+        else:
+            entity = _single(entity_dict, class_)
+        for j, pro in enumerate(pros):
+            entity.add_pro(pro, values[j] if j < len(values) else defaults.get(pro, ''))
+    return extract
+
+
+class Spec:
+    """实例为编译好的一个声明式模板，接口与utils下的解析模块相同"""
+
+    def __init__(self, spec):
+        self.SCHEME_ID = spec['scheme_id']
+        self.classes = spec['classes']
+        self.data_properties = spec['data_properties']
+        self.object_properties = dict(enumerate(spec.get('object_properties', [])))
+        self.class_std = spec.get('class_std')
+        self.defaults = spec.get('defaults', {})
+        self.rules = spec.get('paragraphs', [])
+        self.constants = spec.get('constants', [])
+        self._read_table = _compile_table(spec['table'], self.defaults) if 'table' in spec else None
+        self._rule_set = RuleSet(self.rules) if self.rules else None
+        self._extract = {rule['rule_no']: _compile_rule(rule, self.defaults) for rule in self.rules}
+
+    def read_file(self, file_path):
+        """读取一个docx文件，file_path可以是文件路径、bytes或类文件对象"""
+        docx = read_docx(file_path)
+        if docx is None:
+            return
+        entity_dict = {}
+        if self._read_table is not None:
+            self._read_table(docx, entity_dict)
+        if self._rule_set is not None:
+            for rule, p in self._rule_set.scan(docx.paragraphs):
+                self._extract[rule['rule_no']](p, entity_dict)
+        for class_, pro in self.constants:
+            _single(entity_dict, class_).add_pro(pro, self.defaults[pro])
+        return entity_dict
+
+    def save(self, entity_dict, object_properties1=None, class_std_id=None, conn=None):
+        """将提取的结果存入对应的数据库
+
+        传入conn时使用该连接且不提交事务，由调用方负责提交或回滚；
+        否则从连接池取出连接，在一个事务中写入
+        """
+        if conn is None:
+            with connection() as conn:
+                return self.save(entity_dict, object_properties1, class_std_id, conn=conn)
+        write(conn.cursor(), self.SCHEME_ID, entity_dict, self.object_properties, object_properties1, class_std_id)
+
+
+def discover(spec_dir=SPEC_DIR):
+    """目录下的声明式模板：模板名称 -> JSON文件路径"""
+    if not os.path.isdir(spec_dir):
+        return {}
+    return {name[:-len('.json')]: os.path.join(spec_dir, name)
+            for name in sorted(os.listdir(spec_dir)) if name.endswith('.json')}
+
+
+def read_spec(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load(path):
+    """读取并编译一个声明式模板"""
+    return Spec(read_spec(path))
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""标准目录
+
+将bz_tab、bz_1_info、bz_2_info三张标准表一次性读入内存，标题去除空格后建立索引，
+查找时依次查这三张表，不再逐条查询数据库，也不再改写标准表中的数据。
+距上次加载超过config.standards_refresh秒后，下次查找前用CHECKSUM TABLE检查三张表，
+有变化时重新加载，目录的版本加一，已加载的模板（见utils.registry）下次使用前按新的目录重新查找引用的标准。
+"""
+import threading
+import time
+import config
+from utils.db import connection
+
+# 依次查找的标准表及其标题字段
+TABLES = [
+    ('bz_tab', 'BZ_name'),
+    ('bz_1_info', 'BZ_first_title'),
+    ('bz_2_info', 'BZ_second_title'),
+]
+
+
+def normalize(title):
+    return title.replace(' ', '')
+
+
+class StandardsIndex:
+    """实例保存三张标准表中 标题 -> id 的索引"""
+
+    def __init__(self, refresh=None):
+        self.refresh = config.standards_refresh if refresh is None else refresh
+        self.index = {}  # 表名 -> {标题: id}
+        self.checksums = None
+        self.loaded_at = None
+        self.version = 0  # 每次加载后加一
+        self.lock = threading.Lock()
+
+    def lookup(self, title):
+        """返回(表名, id)，没有找到时返回None"""
+        self._ensure_fresh()
+        title = normalize(title)
+        for table, _ in TABLES:
+            id_ = self.index.get(table, {}).get(title)
+            if id_ is not None:
+                return table, id_
+
+    def _ensure_fresh(self):
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.refresh:
+            return
+        with self.lock:
+            if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.refresh:
+                return
+            with connection() as conn:
+                cr = conn.cursor()
+                checksums = self._checksums(cr)
+                if checksums != self.checksums:
+                    self.index = self._load(cr)
+                    self.checksums = checksums
+                    self.version += 1
+            self.loaded_at = time.monotonic()
+
+    @staticmethod
+    def _checksums(cr):
+        cr.execute('checksum table ' + ', '.join(f'`{table}`' for table, _ in TABLES))
+        return tuple(row[1] for row in cr.fetchall())
+
+    @staticmethod
+    def _load(cr):
+        index = {}
+        for table, column in TABLES:
+            titles = index[table] = {}
+            cr.execute(f'select `id`, `{column}` from `{table}`')
+            for id_, title in cr.fetchall():
+                if title is not None:
+                    # 标题相同时取第一条，与原先逐条查询时的结果一致
+                    titles.setdefault(normalize(title), id_)
+        return index
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_index():
+    """当前进程的标准目录，首次调用时创建"""
+    global _index
+    with _lock:
+        if _index is None:
+            _index = StandardsIndex()
+    return _index
+
+
+def current_version():
+    """标准目录的版本，距上次检查超过config.standards_refresh秒时先检查标准表"""
+    index = get_index()
+    index._ensure_fresh()
+    return index.version
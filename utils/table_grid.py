@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""表格网格
+
+对read_docx读出的表格（见utils.docx_reader.Table）一次性解析横向合并（gridSpan）及纵向合并（vMerge），
+之后按(行, 列)取单元格、按行取单元格都不再重复计算。
+
+与python-docx的对应关系：
+- row(r)相当于table.rows[r].cells去重后的结果：每个w:tc一个单元格，
+  纵向合并的后续单元格取合并区域首个单元格（其上方同一列）的内容；
+- visible(r)为该行每个w:tc自身的内容，纵向合并的后续单元格一般为空；
+- cell(r, c)为网格中第r行第c列所在的合并区域，合并区域内的各个位置得到的是同一个单元格；
+- column(r, i)为第r行第i个单元格（w:tc）起始的列，可用于cell取其下方的单元格；
+  列按每行实际的位置（含gridBefore）计算，某行的单元格没有占满所有列时，python-docx的table.cell会错位，这里不会。
+"""
+
+
+class TableGrid:
+    """实例为一个表格解析合并单元格后的网格，行号可以为负数"""
+
+    def __init__(self, table):
+        self.visible_rows = [row.cells for row in table.rows]
+        self.rows = []  # 每行的单元格，纵向合并的取首个单元格
+        self.columns = []  # 每行每个单元格起始的列
+        self.grid = {}  # (行, 列) -> 单元格
+        for r, row in enumerate(table.rows):
+            cells = []
+            columns = []
+            col = row.grid_before
+            for tc in row.cells:
+                cell = tc
+                # 上方同一列没有单元格时python-docx会报错，这里当作独立的单元格
+                if tc.v_merge == 'continue' and (r - 1, col) in self.grid:
+                    cell = self.grid[(r - 1, col)]
+                cells.append(cell)
+                columns.append(col)
+                for c in range(col, col + tc.grid_span):
+                    self.grid[(r, c)] = cell
+                col += tc.grid_span
+            self.rows.append(cells)
+            self.columns.append(columns)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def row(self, r):
+        return self.rows[r]
+
+    def visible(self, r):
+        return self.visible_rows[r]
+
+    def column(self, r, i):
+        return self.columns[r][i]
+
+    def cell(self, r, c):
+        """第r行第c列所在的单元格，该位置没有单元格时返回None"""
+        if r < 0:
+            r += len(self.rows)
+        return self.grid.get((r, c))
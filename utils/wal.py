@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+"""写前日志
+
+设置config.wal_dir后，解析结果不再直接写入数据库，而是先追加到该目录下的日志段文件中，
+再由后台的重放线程按段、按记录的先后分批写入数据库。数据库变慢或不可用时解析照常进行，
+重放线程每隔config.wal_retry_interval秒重试一次。
+
+每条记录是一个文档要写入的行（格式同workers.extract_rows的结果），在文件中为
+长度（4字节）+ crc32（4字节）+ JSON。解析时不访问数据库，记录中没有实体——标准关系的行（standards为False），
+重放时查找引用的标准后补上。每个进程一个当前段，超过config.wal_segment_size字节后换新段。
+重放到的位置与数据在同一个事务中记入extract_wal表，重启后从上次提交的位置继续，不会重复写入；
+因数据本身的问题无法写入的记录转存到目录下的rejected.jsonl，不影响其后的记录。
+
+同一目录可由多个进程共用：写日志的进程对自己的当前段加排他锁，能加上锁的段即已写完，重放完后删除；
+同一时刻只有持有replay.lock的进程重放。文件锁使用fcntl，所以写前日志只能在Linux等类Unix系统上开启，
+在Windows上设置config.wal_dir时报错，未设置时不受影响。手动重放：python -m utils.wal
+"""
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+import zlib
+import pymysql
+from pymysql.constants import CR, ER
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+import config
+from utils import manifest
+from utils.db import PoolTimeoutError, connection
+from utils.registry import get_template
+from utils.writer import BulkWriter
+
+TABLE = 'extract_wal'
+SUFFIX = '.wal'
+REJECTED = 'rejected.jsonl'
+
+_HEADER = struct.Struct('<II')  # 记录长度、crc32
+
+# 这些错误说明数据库暂时不可用，稍后重试，而不是把记录当作无法写入的数据
+_UNAVAILABLE_CODES = {
+    CR.CR_CONN_HOST_ERROR, CR.CR_SERVER_GONE_ERROR, CR.CR_SERVER_LOST,
+    ER.CON_COUNT_ERROR, ER.SERVER_SHUTDOWN, ER.LOCK_WAIT_TIMEOUT, ER.LOCK_DEADLOCK,
+}
+
+_table_ready = False
+
+
+def _check_platform():
+    if fcntl is None:
+        raise RuntimeError('写前日志（config.wal_dir）依赖fcntl文件锁，只能在Linux等类Unix系统上开启')
+
+
+def is_unavailable(e):
+    """异常是否因数据库暂时不可用（无法连接、连接断开、等待连接或锁超时）"""
+    if isinstance(e, (pymysql.err.InterfaceError, PoolTimeoutError)):
+        return True
+    return isinstance(e, pymysql.err.OperationalError) and bool(e.args) and e.args[0] in _UNAVAILABLE_CODES
+
+
+def ensure_table(cr):
+    global _table_ready
+    if _table_ready:
+        return
+    cr.execute(f"""create table if not exists `{TABLE}`(
+                `segment` varchar(255) comment '日志段文件名',
+                `position` bigint not null comment '已重放到的位置（字节）',
+                `updated` datetime default current_timestamp on update current_timestamp,
+                primary key (`segment`)
+                )
+            """)
+    _table_ready = True
+
+
+def list_segments(wal_dir):
+    """目录下的日志段，按创建的先后排序"""
+    if not os.path.isdir(wal_dir):
+        return []
+    return sorted(name for name in os.listdir(wal_dir) if name.endswith(SUFFIX))
+
+
+def read_records(path, position, limit):
+    """从position开始读取最多limit条完整的记录，返回(记录, 读到的位置)
+
+    遇到不完整的记录（正在写入或写入时中断）即停止
+    """
+    records = []
+    with open(path, 'rb') as f:
+        f.seek(position)
+        while len(records) < limit:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                break
+            length, crc = _HEADER.unpack(header)
+            data = f.read(length)
+            if len(data) < length or zlib.crc32(data) != crc:
+                break
+            records.append(json.loads(data.decode('utf-8')))
+            position += _HEADER.size + length
+    return records, position
+
+
+def is_sealed(path):
+    """日志段是否已写完：写入的进程换段或退出后会释放该段的锁"""
+    with open(path, 'rb') as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+    return True
+
+
+def _fsync_dir(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class WriteAheadLog:
+    """实例将记录追加到当前进程的日志段中"""
+
+    def __init__(self, wal_dir, segment_size=None):
+        _check_platform()
+        self.wal_dir = wal_dir
+        self.segment_size = segment_size or config.wal_segment_size
+        self.f = None
+        self.lock = threading.Lock()
+        os.makedirs(wal_dir, exist_ok=True)
+
+    def append(self, record):
+        data = json.dumps(record, ensure_ascii=False).encode('utf-8')
+        with self.lock:
+            if self.f is None or self.f.tell() >= self.segment_size:
+                self._roll()
+            try:
+                self.f.write(_HEADER.pack(len(data), zlib.crc32(data)) + data)
+                self.f.flush()
+                if config.wal_fsync:
+                    os.fsync(self.f.fileno())
+            except Exception:
+                # 写入一半的记录留在段尾，换新段后由重放线程丢弃
+                self.close()
+                raise
+
+    def _roll(self):
+        self.close()
+        name = f'{time.time_ns():020d}-{socket.gethostname()}-{os.getpid()}'
+        tmp = os.path.join(self.wal_dir, name + '.tmp')
+        f = open(tmp, 'ab')
+        fcntl.flock(f, fcntl.LOCK_EX)
+        # 加锁后再改名，重放线程看到的当前段一定已被锁住
+        os.replace(tmp, os.path.join(self.wal_dir, name + SUFFIX))
+        if config.wal_fsync:
+            _fsync_dir(self.wal_dir)
+        self.f = f
+
+    def close(self):
+        """关闭当前段，文件关闭后锁随之释放"""
+        if self.f is not None:
+            try:
+                self.f.close()
+            finally:
+                self.f = None
+
+
+class Replayer:
+    """实例把目录下的日志重放到数据库，同一进程中只需一个"""
+
+    def __init__(self, wal_dir, batch_docs=None):
+        _check_platform()
+        self.wal_dir = wal_dir
+        self.batch_docs = batch_docs or config.wal_batch_docs
+        self.lock_file = None
+        self.mutex = threading.Lock()
+
+    def acquire(self):
+        """取得重放权，其他进程正在重放时返回False"""
+        if self.lock_file is not None:
+            return True
+        os.makedirs(self.wal_dir, exist_ok=True)
+        f = open(os.path.join(self.wal_dir, 'replay.lock'), 'a')
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            f.close()
+            return False
+        self.lock_file = f
+        return True
+
+    def release(self):
+        if self.lock_file is not None:
+            self.lock_file.close()
+            self.lock_file = None
+
+    def run(self):
+        """后台线程：有日志时逐批重放，出错后等待config.wal_retry_interval秒重试"""
+        while True:
+            try:
+                if self.acquire() and self.replay_once():
+                    continue
+                time.sleep(config.wal_poll_interval)
+            except Exception as e:
+                print(f'重放写前日志出错，{config.wal_retry_interval}秒后重试：{type(e).__name__}: {e}')
+                time.sleep(config.wal_retry_interval)
+
+    def replay_once(self):
+        """重放一批记录或删除一个已重放完的段，没有可做的事时返回False"""
+        with self.mutex:
+            segments = list_segments(self.wal_dir)
+            if not segments:
+                return False
+            with connection() as conn:
+                cr = conn.cursor()
+                # 建表语句会隐式提交事务，所以在重放前确保表存在
+                ensure_table(cr)
+                if config.manifest:
+                    manifest.ensure_table(cr)
+                cr.execute(f'select `segment`, `position` from `{TABLE}`')
+                positions = dict(cr.fetchall())
+                for segment in segments:
+                    path = os.path.join(self.wal_dir, segment)
+                    records, end = read_records(path, positions.get(segment, 0), self.batch_docs)
+                    if records:
+                        # 解析时没有访问数据库，在事务开始前查找引用的标准并建好模板的表
+                        for name in {record['template'] for record in records}:
+                            get_template(name)
+                        self._apply(conn, segment, records, end)
+                        return True
+                    if is_sealed(path):
+                        if os.path.getsize(path) > end:
+                            print(f'日志段{segment}自{end}字节起的内容不完整，已丢弃')
+                        os.remove(path)
+                        cr.execute(f'delete from `{TABLE}` where `segment` = %s', (segment,))
+                        conn.commit()
+                        return True
+            return False
+
+    def _apply(self, conn, segment, records, end):
+        """在一个事务中写入一批记录并推进该段的位置，出错时回滚并逐条用保存点重写"""
+        cr = conn.cursor()
+        try:
+            conn.begin()
+            writer = BulkWriter(cr)
+            for record in records:
+                _write_record(cr, writer, record)
+            writer.flush()
+            _save_position(cr, segment, end)
+            conn.commit()
+        except Exception as e:
+            _rollback(conn)
+            if is_unavailable(e):
+                raise
+            self._apply_each(conn, segment, records, end)
+
+    def _apply_each(self, conn, segment, records, end):
+        cr = conn.cursor()
+        rejected = []
+        try:
+            conn.begin()
+            for record in records:
+                cr.execute('savepoint wal_record')
+                try:
+                    writer = BulkWriter(cr)
+                    _write_record(cr, writer, record)
+                    writer.flush()
+                except Exception as e:
+                    if is_unavailable(e):
+                        raise
+                    cr.execute('rollback to savepoint wal_record')
+                    rejected.append(dict(record, error=f'{type(e).__name__}: {e}'))
+            if rejected:
+                # 先保存无法写入的记录再提交，提交失败时下次重放会再次转存，不会丢失
+                self._reject(rejected)
+            _save_position(cr, segment, end)
+            conn.commit()
+        except Exception:
+            _rollback(conn)
+            raise
+
+    def _reject(self, records):
+        with open(os.path.join(self.wal_dir, REJECTED), 'a', encoding='utf-8') as f:
+            for record in records:
+                print(f"日志中的记录无法写入数据库，已转存到{REJECTED}：{record['file']}，{record['error']}")
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _write_record(cr, writer, record):
+    # 解析时数据库不可用则没有检查清单，重放时内容已解析过的文件不再写入
+    if 'content_hash' in record and manifest.is_extracted(cr, record['content_hash']):
+        return
+    if record.get('standards') is False:
+        record = _add_standards(record)
+    manifest.write_rows(cr, writer, record)
+
+
+def _add_standards(record):
+    """补上解析时没有生成的实体——标准关系的行，及清单中对应的关系表"""
+    template = get_template(record['template'], prepare=False)  # 已在事务开始前准备好，见replay_once
+    tables = dict(record['tables'])
+    for table, columns, row in template.standard_rows(record['tables']):
+        tables.setdefault(table, [columns, []])[1].append(row)
+    record = dict(record, tables=tables)
+    if 'row_ids' in record:
+        record['row_ids'] = dict(record['row_ids'], relations=template.relation_tables())
+    return record
+
+
+def _save_position(cr, segment, position):
+    cr.execute(f"""insert into `{TABLE}` (`segment`, `position`) values (%s, %s)
+               on duplicate key update `position` = values(`position`)""", (segment, position))
+
+
+def _rollback(conn):
+    try:
+        conn.rollback()
+    except Exception:
+        pass
+
+
+_log = None
+_replayer = None
+_lock = threading.Lock()
+
+
+def get_replayer():
+    global _replayer
+    with _lock:
+        if _replayer is None:
+            _replayer = Replayer(config.wal_dir)
+    return _replayer
+
+
+def get_log():
+    """当前进程的日志，首次调用时创建，并启动后台重放线程"""
+    global _log
+    replayer = get_replayer()
+    with _lock:
+        if _log is None:
+            _log = WriteAheadLog(config.wal_dir)
+            threading.Thread(target=replayer.run, daemon=True).start()
+    return _log
+
+
+def append(record):
+    """将一个文档要写入的行追加到日志"""
+    get_log().append(record)
+
+
+def drain():
+    """在当前进程中把日志全部重放到数据库，返回尚未重放完的段数
+
+    其他进程正在重放或数据库不可用时提前返回
+    """
+    if not config.wal_dir:
+        return 0
+    with _lock:
+        if _log is not None:
+            _log.close()  # 当前进程写的段也要关闭后才能删除
+    replayer = get_replayer()
+    try:
+        if replayer.acquire():
+            while replayer.replay_once():
+                pass
+    except Exception as e:
+        print(f'重放写前日志出错：{type(e).__name__}: {e}')
+    return len(list_segments(config.wal_dir))
+
+
+if __name__ == '__main__':
+    if not config.wal_dir:
+        sys.exit('未设置config.wal_dir')
+    pending = drain()
+    print(f'尚有{pending}个日志段未重放完' if pending else '日志已全部写入数据库')
+    sys.exit(1 if pending else 0)
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+"""多进程解析
+
+维护一个常驻的进程池，每个工作进程启动时预先加载模板，之后复用。
+为避免子进程继承父进程的数据库连接，进程池使用spawn方式启动。
+"""
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import config
+from utils import manifest, read_docx, wal
+from utils.db import connection
+from utils.detect import detect_template
+from utils.registry import AUTO, extract_file, get_template, preload, count_rows, serialize
+
+_pool = None
+_lock = threading.Lock()
+
+
+def list_docx(file_path):
+    """列出路径下的所有docx文件，路径为文件时直接返回该文件"""
+    if os.path.isfile(file_path):
+        return [file_path]
+    files = []
+    for file in os.listdir(file_path):
+        if file.endswith('.docx'):
+            files.append(os.path.join(file_path, file))
+    return files
+
+
+def extract_one(name, file_path, with_entities=False, data=None, conn=None):
+    """解析一个文件，异常不向外抛出，而是记录在返回结果中
+
+    with_entities为True时，结果中附带提取出的实体（见registry.serialize）；
+    data为文档内容（bytes或类文件对象）时直接解析data，file_path仅用于标识该文档；
+    传入conn时使用该连接写入且不提交事务。
+    开启config.manifest时，内容已解析过的文件直接跳过（结果中skipped为True）；
+    开启写前日志时不在解析前检查（数据库可能不可用），由重放时跳过。
+    """
+    start = time.perf_counter()
+    result = {'template': name, 'file': file_path, 'state': 0, 'msg': '', 'rows': 0}
+    try:
+        _extract_one(result, name, file_path, with_entities, data, conn)
+    except Exception as e:
+        result['msg'] = f'{type(e).__name__}: {e}'
+    result['elapsed'] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def _extract_one(result, name, file_path, with_entities, data, conn):
+    source = file_path if data is None else data
+    hash_ = None
+    if config.manifest and data is None:
+        # 读入内存后计算哈希并直接解析，不再重复读文件
+        with open(file_path, 'rb') as f:
+            source = f.read()
+        hash_ = manifest.content_hash(source)
+        if not config.wal_dir and _is_extracted(hash_, conn):
+            result.update(state=1, msg='skipped', skipped=True)
+            return
+    if name == AUTO:
+        # 只读取一次文档，识别后直接交给对应模板解析
+        source = read_docx(source)
+        if source is None:
+            result['msg'] = '路径不正确或目标为加密文档'
+            return
+        name = result['template'] = detect_template(source)
+        if name is None:
+            result['msg'] = '无法识别文档所属的模板'
+            return
+    if config.wal_dir:
+        entity_dict = _extract_to_wal(name, file_path, source, hash_)
+    elif hash_ is None:
+        entity_dict = extract_file(name, source, conn)
+    else:
+        entity_dict = _extract_with_manifest(name, file_path, source, hash_, conn)
+    if entity_dict is None:
+        result['msg'] = '路径不正确或目标为加密文档'
+        return
+    result.update(state=1, msg='success', rows=count_rows(entity_dict))
+    if with_entities:
+        result['entities'] = serialize(entity_dict)
+
+
+def _is_extracted(hash_, conn):
+    if conn is None:
+        with connection() as conn:
+            return manifest.is_extracted(conn.cursor(), hash_)
+    return manifest.is_extracted(conn.cursor(), hash_)
+
+
+def _extract_to_wal(name, file_path, source, hash_):
+    """解析并把要写入的行追加到写前日志（见utils.wal），由重放线程写入数据库
+
+    解析时不访问数据库：实体——标准关系的行由重放时补上
+    """
+    template = get_template(name, prepare=False)
+    entity_dict = template.read_file(source)
+    if entity_dict is not None:
+        record = {'template': name, 'file': file_path, 'tables': template.tables(entity_dict, standards=False),
+                  'standards': False}
+        if hash_ is not None:
+            record.update(content_hash=hash_, row_ids=manifest.written_rows(name, entity_dict, standards=False))
+        wal.append(record)
+    return entity_dict
+
+
+def _extract_with_manifest(name, file_path, source, hash_, conn):
+    """在一个事务中删除该路径上次写入的行、写入本次结果并更新清单
+
+    按业务键写入时先写入本次结果，upsert复用上次写入的实体id，之后只删除没有复用的行
+    """
+    if conn is None:
+        get_template(name)  # 建表语句会隐式提交事务，所以在事务开始前加载模板
+        with connection() as conn:
+            conn.begin()
+            return _extract_with_manifest(name, file_path, source, hash_, conn)
+    # 传入conn时已在事务中，模板由调用方在事务开始前准备好（见extract_batch）
+    template = get_template(name, prepare=False)
+    cr = conn.cursor()
+    upsert = bool(config.upsert and config.business_keys.get(template.module.SCHEME_ID))
+    if not upsert:
+        manifest.forget(cr, file_path)
+    entity_dict = extract_file(name, source, conn)
+    if entity_dict is not None:
+        manifest.remember(cr, file_path, hash_, name, entity_dict, forget_old=upsert)
+    return entity_dict
+
+
+def extract_batch(items, with_entities=False):
+    """在事务中处理一组(模板名称, 文件路径)
+
+    每一项写入前设置保存点，失败时只回滚该项；
+    每处理config.group_commit_docs项或经过config.group_commit_ms毫秒提交一次，
+    某次提交前出错时，该次尚未提交的项及其后的项均记为失败；
+    设置了config.wal_dir时逐项写入写前日志，不使用事务
+    """
+    if config.wal_dir:
+        return [extract_one(name, file_path, with_entities) for name, file_path in items]
+    names = {name for name, _ in items}
+    names = None if AUTO in names else names  # 需要自动识别时加载全部模板
+    results = []
+    try:
+        with connection() as conn:
+            cr = conn.cursor()
+            if config.manifest:
+                manifest.ensure_table(cr)
+            group = []
+            for name, file_path in items:
+                if not group:
+                    # 建表语句会隐式提交事务，所以每次开始事务前准备好用到的模板，
+                    # 标准目录重新加载后也只在这里重新查找引用的标准，事务中不再准备模板
+                    preload(names)
+                    conn.begin()
+                    started = time.monotonic()
+                cr.execute('savepoint batch_item')
+                result = extract_one(name, file_path, with_entities, conn=conn)
+                if not result['state']:
+                    cr.execute('rollback to savepoint batch_item')
+                group.append(result)
+                if (len(group) >= config.group_commit_docs
+                        or (time.monotonic() - started) * 1000 >= config.group_commit_ms):
+                    conn.commit()
+                    results.extend(group)
+                    group = []
+            conn.commit()
+            results.extend(group)
+    except Exception as e:
+        msg = f'{type(e).__name__}: {e}'
+        results.extend({'template': name, 'file': file_path, 'state': 0, 'msg': msg, 'rows': 0}
+                       for name, file_path in items[len(results):])
+    return results
+
+
+def batch_tasks(items, workers=None, chunk_size=None, with_entities=False):
+    """将(模板名称, 文件路径)分组，每组为一个extract_batch任务（见iter_tasks）"""
+    workers = workers or config.workers
+    chunk_size = chunk_size or config.batch_chunk_size
+    if workers > 1 and isinstance(items, (list, tuple)):
+        # 项数较少时减小每组的大小，让每个进程都能分到
+        chunk_size = max(1, min(chunk_size, -(-len(items) // workers)))
+    return ((extract_batch, chunk, with_entities) for chunk in _chunked(items, chunk_size))
+
+
+def _init_worker(names):
+    # 初始化出错会使整个进程池不可用，所以这里只提示，用到模板时再加载；
+    # 开启写前日志时只加载模板，不访问数据库
+    try:
+        preload(names, prepare=not config.wal_dir)
+    except Exception as e:
+        print(f'工作进程预先加载模板出错：{type(e).__name__}: {e}')
+
+
+def extract_rows(name, file_path):
+    """解析一个文件但不写入，返回处理结果
+
+    成功时附带tables：表名 -> (字段, 行)，字段顺序与utils.initialize建表时一致；
+    开启config.manifest时还附带content_hash及row_ids（见manifest.written_rows）
+    """
+    start = time.perf_counter()
+    result = {'template': name, 'file': file_path, 'state': 0, 'msg': '', 'rows': 0}
+    try:
+        _extract_rows(result, name, file_path)
+    except Exception as e:
+        result['msg'] = f'{type(e).__name__}: {e}'
+        result.pop('tables', None)
+    result['elapsed'] = round(time.perf_counter() - start, 4)
+    return [result]
+
+
+def _extract_rows(result, name, file_path):
+    with open(file_path, 'rb') as f:
+        source = f.read()
+    if config.manifest:
+        hash_ = result['content_hash'] = manifest.content_hash(source)
+        with connection() as conn:
+            if manifest.is_extracted(conn.cursor(), hash_):
+                result.update(state=1, msg='skipped', skipped=True)
+                return
+    if name == AUTO:
+        source = read_docx(source)
+        if source is None:
+            result['msg'] = '路径不正确或目标为加密文档'
+            return
+        name = result['template'] = detect_template(source)
+        if name is None:
+            result['msg'] = '无法识别文档所属的模板'
+            return
+    template = get_template(name)
+    entity_dict = template.read_file(source)
+    if entity_dict is None:
+        result['msg'] = '路径不正确或目标为加密文档'
+        return
+    result['tables'] = template.tables(entity_dict)
+    if config.manifest:
+        result['row_ids'] = manifest.written_rows(name, entity_dict)
+    result.update(state=1, msg='success', rows=count_rows(entity_dict))
+
+
+def get_pool():
+    """获取进程池，进程数由config.workers指定，首次调用时创建"""
+    global _pool
+    with _lock:
+        if _pool is not None and _pool._broken:
+            # 有工作进程异常退出后进程池不再可用，换一个新的
+            _pool.shutdown(wait=False)
+            _pool = None
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=config.workers,
+                                        mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=_init_worker,
+                                        initargs=(config.preload_templates,))
+    return _pool
+
+
+def shutdown():
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def iter_extract(name, file_paths, workers=None, cancel_event=None, ordered=True, with_entities=False,
+                 group_commit=False):
+    """逐个返回每个文件的处理结果
+
+    workers为同时并行解析的文件（组）数，最多为config.workers（见iter_tasks），小于等于1时在当前进程中逐个解析；
+    cancel_event被设置后不再提交新的任务；
+    ordered为True时结果顺序与file_paths一致，否则按完成的先后返回。
+    默认每个文件单独提交，处理完一个即返回一个；group_commit为True时（用于cli.py），
+    每config.batch_chunk_size个文件作为一个任务，由extract_batch合并提交（见其说明），
+    一组全部提交后才返回该组的结果，取消也以组为单位。
+    """
+    workers = workers or config.workers
+    if group_commit:
+        tasks = batch_tasks([(name, p) for p in file_paths], workers, with_entities=with_entities)
+    else:
+        tasks = ((_extract_single, name, file_path, with_entities) for file_path in file_paths)
+    return iter_tasks(tasks, workers, cancel_event, ordered)
+
+
+def iter_tasks(tasks, workers, cancel_event=None, ordered=True):
+    """执行(函数, 参数...)形式的任务，每个任务返回一个结果列表，逐个返回其中的结果
+
+    workers小于等于1时在当前进程中逐个执行，否则交给进程池（函数须能被子进程导入）。
+    进程池由所有调用方共用，进程数固定为config.workers：workers小于该值时最多同时提交workers个任务，
+    即最多占用workers个进程；否则最多同时提交config.workers*2个任务，让进程池保持忙碌
+    """
+    if workers <= 1:
+        for fn, *args in tasks:
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            yield from fn(*args)
+        return
+    # 同时提交的任务数有上限，既不会一次提交全部任务，又能及时响应取消
+    limit = workers if workers < config.workers else config.workers * 2
+    pool = get_pool()
+    pending = deque()
+    tasks = iter(tasks)
+    while True:
+        while len(pending) < limit and not (cancel_event is not None and cancel_event.is_set()):
+            task = next(tasks, None)
+            if task is None:
+                break
+            pending.append(pool.submit(*task))
+        if not pending:
+            return
+        if ordered:
+            future = pending.popleft()
+        else:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            future = done.pop()
+            pending.remove(future)
+        if cancel_event is not None and cancel_event.is_set() and future.cancel():
+            continue
+        yield from future.result()
+
+
+def _extract_single(name, file_path, with_entities):
+    return [extract_one(name, file_path, with_entities)]
+
+
+def _chunked(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def extract_many(name, file_paths, workers=None):
+    """解析多个文件，返回每个文件的处理结果（顺序与file_paths一致）"""
+    return list(iter_extract(name, file_paths, workers))
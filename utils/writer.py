@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""批量写入
+
+按目标表（实体表SCHEME_ID_class、关系表SCHEME_ID_domain_2_range）归并一个文档的所有行，
+每张表用参数化的executemany分批写入（pymysql会将其合并为一条多行insert），
+每批最多config.insert_batch_size行。
+"""
+from uuid import uuid1
+import config
+
+# 关系表写入的字段，rel_name使用建表时的默认值
+REL_COLUMNS = ['id', 'from_id', 'to_id']
+
+
+class BulkWriter:
+    """实例收集待写入的行，flush时按表分批写入"""
+
+    def __init__(self, cr, batch_size=None):
+        self.cr = cr
+        self.batch_size = batch_size or config.insert_batch_size
+        self.rows = {}  # (表名, 字段) -> 行
+        self.files = set()  # 行还在其中的文件路径（见manifest.write_rows）
+
+    def add(self, table, columns, row):
+        self.rows.setdefault((table, tuple(columns)), []).append(row)
+
+    def flush(self):
+        for (table, columns), rows in self.rows.items():
+            fields = ', '.join(f'`{c}`' for c in columns)
+            marks = ', '.join(['%s'] * len(columns))
+            sql = f'insert into `{table}` ({fields}) values ({marks})'
+            for i in range(0, len(rows), self.batch_size):
+                self.cr.executemany(sql, rows[i:i + self.batch_size])
+        self.rows = {}
+        self.files = set()
+
+
+def _to_str(value):
+    # 个别属性的值为列表，与原先拼接SQL时一样按其字符串形式保存
+    return value if isinstance(value, str) else str(value)
+
+
+def group_entities(entity_dict):
+    """类名 -> 该类的所有实体（entity_dict的键不一定等于类名）"""
+    entities = {}
+    for value in entity_dict.values():
+        for entity in value if isinstance(value, list) else [value]:
+            entities.setdefault(entity.class_, []).append(entity)
+    return entities
+
+
+def iter_rows(scheme_id, entity_dict, object_properties, object_properties1=None, class_std_id=None):
+    """一个文档提取出的实体、实体间的关系及实体与标准的关系对应的行：(表名, 字段, 值)
+
+    文档中没有出现的类跳过，不写入与其相关的关系
+    """
+    entities = group_entities(entity_dict)
+    # 存实体
+    for class_, items in entities.items():
+        tab = scheme_id + '_' + class_
+        for entity in items:
+            yield tab, ['id'] + list(entity.pros), [entity.id_] + [_to_str(v) for v in entity.pros.values()]
+    # 存关系
+    for rel in object_properties.values():
+        domain, range_ = rel['domain'], rel['range']
+        rel_tab = scheme_id + '_' + domain + '_2_' + range_
+        for from_entity in entities.get(domain, []):
+            for to_entity in entities.get(range_, []):
+                yield rel_tab, REL_COLUMNS, [uuid1().hex, from_entity.id_, to_entity.id_]
+    # 存实体——标准关系
+    entity_ids = {class_: [entity.id_ for entity in items] for class_, items in entities.items()}
+    yield from iter_standard_rows(scheme_id, entity_ids, object_properties1, class_std_id)
+
+
+def iter_standard_rows(scheme_id, entity_ids, object_properties1, class_std_id):
+    """实体与标准的关系对应的行：(表名, 字段, 值)，entity_ids为 类名 -> 实体id列表"""
+    for rel in (object_properties1 or {}).values():
+        domain, range_ = rel['domain'], rel['range']
+        rel_tab = scheme_id + '_' + domain + '_2_' + range_
+        for from_id in entity_ids.get(domain, []):
+            for to_id in class_std_id[domain][range_]:
+                yield rel_tab, REL_COLUMNS, [uuid1().hex, from_id, to_id]
+
+
+def write(cr, scheme_id, entity_dict, object_properties, object_properties1=None, class_std_id=None):
+    """将一个文档的所有行按表批量写入（参数见iter_rows）
+
+    开启config.upsert且该模板配置了业务键（config.business_keys）时改为按业务键更新，见upsert
+    """
+    keys = config.business_keys.get(scheme_id) if config.upsert else None
+    if keys and upsert(cr, scheme_id, keys, entity_dict, object_properties, object_properties1, class_std_id):
+        return
+    writer = BulkWriter(cr)
+    for table, columns, row in iter_rows(scheme_id, entity_dict, object_properties, object_properties1, class_std_id):
+        writer.add(table, columns, row)
+    writer.flush()
+
+
+def _key_entity(entities, keys):
+    """包含全部业务键且键值非空的唯一实体"""
+    for class_, items in entities.items():
+        if len(items) == 1 and all(items[0].pros.get(k) for k in keys):
+            return items[0]
+
+
+def _execute_in(cr, sql, ids):
+    if not ids:
+        return []
+    cr.execute(sql.format(marks=','.join(['%s'] * len(ids))), list(ids))
+    return cr.fetchall()
+
+
+def _old_graph(cr, scheme_id, root_class, root_ids, object_properties):
+    """从已有的根实体出发，沿关系找出上次写入的各类实体：类名 -> id列表"""
+    ids = {root_class: list(root_ids)}
+    pending = [root_class]
+    while pending:
+        domain = pending.pop()
+        for rel in object_properties.values():
+            range_ = rel['range']
+            if rel['domain'] != domain or range_ in ids:
+                continue
+            rel_tab = scheme_id + '_' + domain + '_2_' + range_
+            rows = _execute_in(cr, f'select `to_id` from `{rel_tab}` where `from_id` in ({{marks}})', ids[domain])
+            ids[range_] = list(dict.fromkeys(r[0] for r in rows))
+            pending.append(range_)
+    return ids
+
+
+def _changes(entity, row):
+    """实体与已有的行相比变化了的字段：(字段, 新值)列表，实体中没有的属性置为NULL"""
+    changes = []
+    for column in set(entity.pros) | set(row):
+        value = _to_str(entity.pros[column]) if column in entity.pros else None
+        if row.get(column) != value:
+            changes.append((column, value))
+    return changes
+
+
+def upsert(cr, scheme_id, keys, entity_dict, object_properties, object_properties1=None, class_std_id=None):
+    """按业务键写入一个文档，没有包含业务键的实体时返回False，由调用方按普通方式写入
+
+    业务键所在的实体（通常是文档本身对应的类）已存在时，沿关系找出上次写入的实体并复用其id：
+    内容相同的实体不做修改，内容变化的实体只更新变化的字段，多出的实体插入，不再出现的实体删除；
+    上次写入的关系行全部删除后重新写入。调用方负责事务，保证这些修改一并生效。
+    """
+    entities = group_entities(entity_dict)
+    key_entity = _key_entity(entities, keys)
+    if key_entity is None:
+        return False
+    root_class = key_entity.class_
+    root_tab = scheme_id + '_' + root_class
+    cr.execute(f'select `id` from `{root_tab}` where ' + ' and '.join(f'`{k}` = %s' for k in keys),
+               [_to_str(key_entity.pros[k]) for k in keys])
+    root_ids = [r[0] for r in cr.fetchall()]
+    old_ids = _old_graph(cr, scheme_id, root_class, root_ids, object_properties) if root_ids else {}
+
+    writer = BulkWriter(cr)
+    for class_, items in entities.items():
+        tab = scheme_id + '_' + class_
+        old_rows = {}
+        rows = _execute_in(cr, f'select * from `{tab}` where `id` in ({{marks}})', old_ids.get(class_, []))
+        for row in rows:
+            row = dict(zip([d[0] for d in cr.description], row))
+            old_rows[row.pop('id')] = row
+        changed = []
+        for entity in items:
+            # 先找内容完全相同的实体，这些实体不需要修改
+            same = next((id_ for id_, row in old_rows.items() if not _changes(entity, row)), None)
+            if same is None:
+                changed.append(entity)
+            else:
+                entity.id_ = same
+                del old_rows[same]
+        for entity in changed:
+            if old_rows:
+                id_, row = next(iter(old_rows.items()))
+                del old_rows[id_]
+                entity.id_ = id_
+                changes = _changes(entity, row)
+                cr.execute(f'update `{tab}` set ' + ', '.join(f'`{c}` = %s' for c, _ in changes)
+                           + ' where `id` = %s', [v for _, v in changes] + [id_])
+            else:
+                writer.add(tab, ['id'] + list(entity.pros), [entity.id_] + [_to_str(v) for v in entity.pros.values()])
+        if old_rows:
+            _execute_in(cr, f'delete from `{tab}` where `id` in ({{marks}})', list(old_rows))
+
+    for class_ in set(old_ids) - set(entities):
+        _execute_in(cr, f'delete from `{scheme_id}_{class_}` where `id` in ({{marks}})', old_ids[class_])
+
+    # 关系整体替换：删除上次写入的实体发出的所有关系，再按本次结果写入
+    all_old = [id_ for ids in old_ids.values() for id_ in ids]
+    entity_tables = {scheme_id + '_' + class_ for class_ in entities}
+    rel_tables = {scheme_id + '_' + rel['domain'] + '_2_' + rel['range']
+                  for rels in (object_properties, object_properties1 or {}) for rel in rels.values()}
+    for rel_tab in sorted(rel_tables):
+        _execute_in(cr, f'delete from `{rel_tab}` where `from_id` in ({{marks}})', all_old)
+    for table, columns, row in iter_rows(scheme_id, entity_dict, object_properties, object_properties1, class_std_id):
+        if table not in entity_tables:
+            writer.add(table, columns, row)
+    writer.flush()
+    return True
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""监视文件夹，新的docx文件写入完成后自动解析入库
+
+用法：python watcher.py [文件夹[=模板名称] ...]
+不指定文件夹时使用config.watch_dirs；模板名称省略时根据文档内容自动识别。
+
+安装了inotify_simple（可选依赖，见requirements.txt，pip install inotify_simple）时使用inotify接收文件变化，否则定期扫描文件夹。
+无论哪种方式，文件的大小和修改时间在config.watch_settle秒内不再变化才认为写入完成，
+以免解析到尚未写完的文件；内容已解析过的文件由清单（见utils.manifest）跳过。
+解析失败的文件在config.watch_retry秒后重试，之后每次失败间隔加倍，最长为config.watch_retry_max秒；
+文件在此期间变化时按新文件处理。
+"""
+import os
+import sys
+import time
+import config
+from utils.registry import AUTO, is_supported
+from utils.workers import iter_extract
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None
+
+
+def is_candidate(name):
+    # 「~$」开头的是Word打开文档时生成的临时文件
+    return name.endswith('.docx') and not name.startswith('~$')
+
+
+class Watcher:
+    """实例监视若干文件夹，每个文件夹对应一个模板"""
+
+    def __init__(self, watch_dirs, interval=None, settle=None, workers=None):
+        self.watch_dirs = {os.path.abspath(d): t for d, t in watch_dirs.items()}
+        self.interval = interval or config.watch_interval
+        self.settle = settle or config.watch_settle
+        self.workers = workers or config.workers
+        self.seen = {}  # 已成功处理的文件 -> (大小, 修改时间)
+        self.pending = {}  # 等待写入完成的文件 -> (大小, 修改时间, 最近一次变化的时间)
+        self.failures = {}  # 解析失败的文件 -> 连续失败的次数
+        self.inotify = None
+        self.wd_dirs = {}
+        if INotify is not None:
+            self.inotify = INotify()
+            mask = flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE | flags.MODIFY
+            for d in self.watch_dirs:
+                self.wd_dirs[self.inotify.add_watch(d, mask)] = d
+
+    def scan(self):
+        """扫描全部文件夹，找出新出现或发生变化的文件"""
+        for d in self.watch_dirs:
+            with os.scandir(d) as it:
+                for entry in it:
+                    if entry.is_file() and is_candidate(entry.name):
+                        self.touch(entry.path)
+
+    def touch(self, path):
+        """记录文件的最新状态，状态发生变化时重新开始计时"""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self.pending.pop(path, None)
+            return
+        state = (st.st_size, st.st_mtime_ns)
+        if self.seen.get(path) == state:
+            return
+        old = self.pending.get(path)
+        if old is None or old[:2] != state:
+            if old is not None:
+                self.failures.pop(path, None)
+            self.pending[path] = state + (time.monotonic(),)
+
+    def ready(self):
+        """返回已写入完成的文件：文件 -> (大小, 修改时间)，并再次确认状态没有变化"""
+        now = time.monotonic()
+        files = {}
+        for path, (size, mtime, changed) in list(self.pending.items()):
+            if now - changed < self.settle:
+                continue
+            self.touch(path)
+            if path in self.pending and self.pending[path][2] == changed:
+                del self.pending[path]
+                files[path] = (size, mtime)
+        return files
+
+    def retry(self, path, state):
+        """解析失败的文件放回等待列表，间隔一段时间后重试"""
+        count = self.failures[path] = self.failures.get(path, 0) + 1
+        delay = min(config.watch_retry * 2 ** (count - 1), config.watch_retry_max)
+        # ready在距changed超过settle秒后才返回该文件
+        self.pending[path] = state + (time.monotonic() + delay - self.settle,)
+        print(f'{path}：{delay}秒后重试')
+
+    def wait(self):
+        """等待下一轮检查：有inotify时等待文件事件，否则睡眠后重新扫描"""
+        if self.inotify is None:
+            time.sleep(self.interval)
+            self.scan()
+            return
+        for event in self.inotify.read(timeout=int(self.interval * 1000)):
+            if is_candidate(event.name):
+                self.touch(os.path.join(self.wd_dirs[event.wd], event.name))
+
+    def process(self, files):
+        """解析ready返回的文件，成功的记为已处理，失败的稍后重试"""
+        by_template = {}
+        for path in files:
+            by_template.setdefault(self.watch_dirs[os.path.dirname(path)], []).append(path)
+        unfinished = dict(files)
+        try:
+            for template, paths in by_template.items():
+                for result in iter_extract(template, paths, self.workers, ordered=False):
+                    print(f"[{result['template']}] {result['file']}：{result['msg']}"
+                          f"（{result['rows']}行，{result['elapsed']}秒）")
+                    path = result['file']
+                    state = unfinished.pop(path)
+                    if result['state']:
+                        self.seen[path] = state
+                        self.failures.pop(path, None)
+                    else:
+                        self.retry(path, state)
+        except Exception as e:
+            print(f'解析出错：{type(e).__name__}: {e}')
+        for path, state in unfinished.items():
+            self.retry(path, state)
+
+    def run(self):
+        mode = 'inotify' if self.inotify is not None else f'每{self.interval}秒扫描一次'
+        print(f'开始监视（{mode}）：{", ".join(self.watch_dirs)}')
+        self.scan()
+        while True:
+            files = self.ready()
+            if files:
+                self.process(files)
+            self.wait()
+
+
+def parse_args(argv):
+    watch_dirs = {}
+    for arg in argv:
+        d, _, template = arg.partition('=')
+        watch_dirs[d] = template or AUTO
+    return watch_dirs
+
+
+if __name__ == '__main__':
+    watch_dirs = parse_args(sys.argv[1:]) or config.watch_dirs
+    for d, template in watch_dirs.items():
+        if not is_supported(template):
+            sys.exit(f'不支持的模板名称：{template}')
+        if not os.path.isdir(d):
+            sys.exit(f'非法的路径：{d}')
+    Watcher(watch_dirs).run()